@@ -6,6 +6,7 @@ import tkinter as tk
 from tkinter import filedialog, Button, Label, Frame
 from PIL import Image, ImageTk
 import os
+import threading
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
 def load_image(image_path):
@@ -15,11 +16,9 @@ def load_image(image_path):
     return img
 
 def enhance_image(img):
-    # Make a copy to avoid modifying the original
-    img_copy = img.copy()
-    
+    # Works on ndarrays and cv2.UMat alike; the input is never modified
     # Convert to grayscale
-    gray = cv2.cvtColor(img_copy, cv2.COLOR_BGR2GRAY)
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
     
     # Apply bilateral filter to remove noise while preserving edges
     bilateral = cv2.bilateralFilter(gray, 11, 17, 17) # diamter,color space isgma, cordinates sigma
@@ -34,34 +33,26 @@ def enhance_image(img):
     return gray, clahe_img
 
 def detect_edges(img):
-    # Apply Sobel edge detection in x and y directions
-    sobel_x = cv2.Sobel(img, cv2.CV_64F, 1, 0, ksize=3)
-    sobel_y = cv2.Sobel(img, cv2.CV_64F, 0, 1, ksize=3)
-    
-    # Combine x and y gradients
-    sobel_combined = cv2.magnitude(sobel_x, sobel_y)
-    
-    # Convert to 8-bit
-    sobel_8u = np.uint8(np.absolute(sobel_combined))
+    # Apply Canny edge detection. A (50, 200) pass is a subset of (30, 150):
+    # its strong seeds and weak edges are both contained in the wider
+    # hysteresis, so a single pass gives the same edges as OR-ing the two
+    edges = cv2.Canny(img, 30, 150)
     
-    # Apply Canny edge detection with multiple thresholds
-    edges1 = cv2.Canny(img, 30, 150)
-    edges2 = cv2.Canny(img, 50, 200)
-    
-    # Combine edge detections
-    combined_edges = cv2.bitwise_or(edges1, edges2)
-    
-    # Morphological operations to close gaps
+    # Morphological operations to close gaps, reusing buffers between stages
     kernel = np.ones((3, 3), np.uint8)
-    dilated = cv2.dilate(combined_edges, kernel, iterations=1)
-    closed = cv2.morphologyEx(dilated, cv2.MORPH_CLOSE, kernel, iterations=1)
+    dilated = cv2.dilate(edges, kernel, iterations=1)
+    closed = cv2.morphologyEx(dilated, cv2.MORPH_CLOSE, kernel, dst=edges, iterations=1)
     
     return closed
 
-def find_plate_contours(edges, original_img):
+def find_plate_contours(edges, original_img, scale=1):
     # Find contours
     contours = imutils.grab_contours(cv2.findContours(edges.copy(), cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)) #retrive all contours,compress contours
     
+    # Edges may come from a downscaled image; map contours back to full resolution
+    if scale != 1:
+        contours = [contour * scale for contour in contours]
+    
     # Copy image for visualization
     img_with_contours = original_img.copy()
     
@@ -71,48 +62,63 @@ def find_plate_contours(edges, original_img):
     # Draw all contours (for visualization)
     cv2.drawContours(img_with_contours, contours, -1, (0, 0, 255), 1)
     
-    for contour in sorted(contours, key=cv2.contourArea, reverse=True)[:30]:
-        area = cv2.contourArea(contour)
+    # Compute every contour area once and keep the 30 largest
+    areas = np.fromiter((cv2.contourArea(c) for c in contours), dtype=np.float64, count=len(contours))
+    order = np.argsort(-areas, kind="stable")[:30]
+    top_contours = [contours[i] for i in order]
+    top_areas = areas[order]
+    
+    # Bounding rects for the candidates as an (N, 4) array of x, y, w, h
+    bboxes = np.array([cv2.boundingRect(c) for c in top_contours], dtype=np.float64).reshape(-1, 4)
+    widths, heights = bboxes[:, 2], bboxes[:, 3]
+    
+    # Aspect ratio (license plates are typically wider than tall) and
+    # extent (ratio of contour area to bounding rect area)
+    aspect_ratios = widths / heights
+    extents = top_areas / (widths * heights)
+    
+    # Reject too small, badly proportioned or sparse contours in one vectorized pass
+    keep = (top_areas >= 300) & (aspect_ratios >= 1.0) & (aspect_ratios <= 8.0) & (extents > 0.45)
+    
+    # Reused for the corner points of every candidate's rotated rectangle
+    box_pts = np.empty((4, 2), dtype=np.float32)
+    
+    # Only the survivors go through the expensive per-contour calls
+    for idx in np.flatnonzero(keep):
+        contour = top_contours[idx]
+        area = float(top_areas[idx])
         
-        # Skip too small contours
-        if area < 300:
-            continue
-            
         # Get perimeter and approximate contour
         perimeter = cv2.arcLength(contour, True)
         approx = cv2.approxPolyDP(contour, 0.02 * perimeter, True)
         
         # License plates typically have 4 corners (rectangular)
-        # But we allow more points to accclearount for imperfect detections
-        if len(approx) >= 4 and len(approx) <= 8:
-            x, y, w, h = cv2.boundingRect(contour)
-            
-            # Filter by aspect ratio (license plates are typically wider than tall)
-            aspect_ratio = float(w) / h
-            if 1.0 <= aspect_ratio <= 8.0:
-                # Calculate extent (ratio of contour area to bounding rect area)
-                extent = float(area) / (w * h)
-                
-                # License plates typically have high extent (mostly filled rectangle)
-                if extent > 0.45:
-                    # Calculate solidity (ratio of contour area to convex hull area)
-                    hull = cv2.convexHull(contour)
-                    hull_area = cv2.contourArea(hull)
-                    solidity = float(area) / hull_area if hull_area > 0 else 0
-                    
-                    # License plates typically have high solidity
-                    if solidity > 0.7:
-                        # Calculate minimum area rectangle (handles tilted plates)
-                        rect = cv2.minAreaRect(contour)
-                        box = cv2.boxPoints(rect)
-                        box = np.intp(box)
-                        
-                        # Store results
-                        score = 0.6 * extent + 0.4 * solidity  # Weighted score
-                        potential_plates.append((box, area, aspect_ratio, score))
-                        
-                        # Draw potential plate contours in blue
-                        cv2.drawContours(img_with_contours, [box], 0, (255, 0, 0), 2)
+        # But we allow more points to account for imperfect detections
+        if not 4 <= len(approx) <= 8:
+            continue
+        
+        # Calculate solidity (ratio of contour area to convex hull area)
+        hull = cv2.convexHull(contour)
+        hull_area = cv2.contourArea(hull)
+        solidity = area / hull_area if hull_area > 0 else 0
+        
+        # License plates typically have high solidity
+        if solidity <= 0.7:
+            continue
+        
+        # Calculate minimum area rectangle (handles tilted plates); the corner
+        # points go into the shared float buffer, only the integer box is new
+        rect = cv2.minAreaRect(contour)
+        cv2.boxPoints(rect, box_pts)
+        box = box_pts.astype(np.intp)
+        
+        # Store results
+        aspect_ratio = float(aspect_ratios[idx])
+        score = 0.6 * float(extents[idx]) + 0.4 * solidity  # Weighted score
+        potential_plates.append((box, area, aspect_ratio, score))
+        
+        # Draw potential plate contours in blue
+        cv2.drawContours(img_with_contours, [box], 0, (255, 0, 0), 2)
     
     # Sort potential plates by score
     potential_plates.sort(key=lambda x: x[3], reverse=True)
@@ -134,6 +140,13 @@ def find_plate_contours(edges, original_img):
 def extract_plate_regions(original_img, potential_plates):
     extracted_plates = []
     
+    # Upload the image once (unless the caller already did) so every warp
+    # runs through OpenCV's T-API (OpenCL when available)
+    u_img = original_img if isinstance(original_img, cv2.UMat) else cv2.UMat(original_img)
+    
+    # One CLAHE instance shared by all plate candidates
+    clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(4, 4))
+    
     for i, (box, _, _, score) in enumerate(potential_plates[:5]):
         # Get rotated rectangle
         rect = cv2.minAreaRect(box)
@@ -147,6 +160,10 @@ def extract_plate_regions(original_img, potential_plates):
         width_rect = int(width)
         height_rect = int(height)
         
+        # Skip degenerate rectangles (nothing to warp)
+        if width_rect <= 0 or height_rect <= 0:
+            continue
+        
         # Set destination points for perspective transform
         dst_pts = np.array([[0, 0],
                            [width_rect - 1, 0],
@@ -155,17 +172,13 @@ def extract_plate_regions(original_img, potential_plates):
         
         # Perspective transform
         M = cv2.getPerspectiveTransform(src_pts, dst_pts)
-        warped = cv2.warpPerspective(original_img, M, (width_rect, height_rect))
+        warped = cv2.warpPerspective(u_img, M, (width_rect, height_rect))
         
         # Convert to grayscale
-        if warped.size == 0:
-            continue
-            
         gray_plate = cv2.cvtColor(warped, cv2.COLOR_BGR2GRAY)
         
-        # Enhance the plate image
-        clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(4, 4))
-        enhanced_plate = clahe.apply(gray_plate)
+        # Enhance the plate image and download the result
+        enhanced_plate = clahe.apply(gray_plate).get()
         
         # Store extracted plate with its score
         extracted_plates.append((enhanced_plate, score))
@@ -183,20 +196,25 @@ def detect_license_plate(image_path):
         scale = max_dim / max(h, w)
         original_img = cv2.resize(original_img, None, fx=scale, fy=scale)
     
-    # Create a copy for processing
-    img_copy = original_img.copy()
+    # Upload once; enhancement and edge detection then stay on the UMat
+    # (OpenCV T-API, OpenCL when available) without host round-trips
+    u_img = cv2.UMat(original_img)
     
     # Enhance image
-    gray, enhanced = enhance_image(img_copy)
+    gray, enhanced = enhance_image(u_img)
     
     # Detect edges
     edges = detect_edges(enhanced)
     
-    # Find potential license plate contours
-    potential_plates, contour_img = find_plate_contours(edges, original_img)
+    # Find potential license plate contours on a half-resolution edge map
+    # (findContours needs host memory, so download only the small map)
+    contour_scale = 2
+    edges_small = cv2.resize(edges, None, fx=1 / contour_scale, fy=1 / contour_scale,
+                             interpolation=cv2.INTER_NEAREST)
+    potential_plates, contour_img = find_plate_contours(edges_small.get(), original_img, scale=contour_scale)
     
     # Extract plate regions
-    extracted_plates = extract_plate_regions(original_img, potential_plates)
+    extracted_plates = extract_plate_regions(u_img, potential_plates)
     
     # Prepare best result image
     result_img = original_img.copy()
@@ -217,8 +235,8 @@ def detect_license_plate(image_path):
     # Create a dict to store all results
     results = {
         'original': original_img,
-        'preprocessed': enhanced,
-        'edges': edges,
+        'preprocessed': enhanced.get(),
+        'edges': edges.get(),
         'contour_detection': contour_img,
         'result': result_img,
         'plate_regions': extracted_plates if extracted_plates else None,
@@ -257,8 +275,22 @@ class LicensePlateDetectionApp:
         # Initialize variables
         self.current_image_path = None
         self.results = None
-        self.fig = None
-        self.canvas = None
+        
+        # Preview figure, built once; later uploads only swap the image data
+        self.preview_fig, self.preview_ax = plt.subplots(figsize=(6, 4))
+        self.preview_im = self.preview_ax.imshow(np.zeros((1, 1, 3), dtype=np.uint8))
+        self.preview_ax.set_title("Uploaded Image")
+        self.preview_ax.axis('off')
+        self.preview_canvas = FigureCanvasTkAgg(self.preview_fig, master=self.result_frame)
+        
+        # Results figure with the six pipeline stages, also built once
+        self.fig, axes = plt.subplots(2, 3, figsize=(12, 8))
+        self.axes = axes.ravel()
+        self.ims = []
+        for ax in self.axes:
+            ax.axis('off')
+            self.ims.append(ax.imshow(np.zeros((1, 1), dtype=np.uint8), cmap='gray'))
+        self.canvas = FigureCanvasTkAgg(self.fig, master=self.result_frame)
     
     def upload_image(self):
         file_path = filedialog.askopenfilename(filetypes=[
@@ -274,33 +306,62 @@ class LicensePlateDetectionApp:
             img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
             self.display_preview(img)
     
+    def show_canvas(self, canvas):
+        # Show the given figure canvas in the result frame and hide the other one
+        for other in (self.preview_canvas, self.canvas):
+            if other is not canvas:
+                other.get_tk_widget().pack_forget()
+        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        canvas.draw_idle()
+    
+    def update_image(self, ax, im, img, title):
+        # Swap the data of an existing AxesImage and fit the axes to its new size
+        im.set_data(img)
+        if img.ndim == 2:
+            im.autoscale()
+        h, w = img.shape[:2]
+        im.set_extent((-0.5, w - 0.5, h - 0.5, -0.5))
+        ax.set_xlim(-0.5, w - 0.5)
+        ax.set_ylim(h - 0.5, -0.5)
+        im.set_visible(True)
+        ax.set_title(title)
+    
     def display_preview(self, img):
-        # Clear existing figure if any
-        if self.fig is not None:
-            plt.close(self.fig)
-            self.canvas.get_tk_widget().destroy()
-            
-        # Create preview
-        self.fig, ax = plt.subplots(figsize=(6, 4))
-        ax.imshow(img)
-        ax.set_title("Uploaded Image")
-        ax.axis('off')
-        
-        # Display in Tkinter
-        self.canvas = FigureCanvasTkAgg(self.fig, master=self.result_frame)
-        self.canvas.draw()
-        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        # Reuse the preview figure
+        self.update_image(self.preview_ax, self.preview_im, img, "Uploaded Image")
+        self.show_canvas(self.preview_canvas)
     
     def process_image(self):
         if not self.current_image_path:
             return
             
         self.status_label.config(text="Processing image... Please wait.")
-        self.root.update()
+        self.result_text.config(text="")
+        
+        # Run the detection pipeline in a worker thread so the UI stays responsive
+        # (OpenCV releases the GIL inside its C++ calls)
+        self.upload_btn.config(state=tk.DISABLED)
+        self.process_btn.config(state=tk.DISABLED)
+        threading.Thread(target=self.run_pipeline, args=(self.current_image_path,), daemon=True).start()
+    
+    def run_pipeline(self, image_path):
+        # Worker thread: never touch Tk widgets here, hand the outcome back to the main loop
+        try:
+            results, error = detect_license_plate(image_path), None
+        except Exception as e:
+            results, error = None, e
+        self.root.after(0, self.on_pipeline_done, results, error)
+    
+    def on_pipeline_done(self, results, error):
+        # Runs on the Tk main thread
+        self.upload_btn.config(state=tk.NORMAL)
+        self.process_btn.config(state=tk.NORMAL)
         
         try:
-            # Run detection pipeline
-            self.results = detect_license_plate(self.current_image_path)
+            if error is not None:
+                raise error
+            
+            self.results = results
             self.display_results()
             
             if self.results['success']:
@@ -315,59 +376,38 @@ class LicensePlateDetectionApp:
             self.result_text.config(text="")
     
     def display_results(self):
-        # Clear existing figure if any
-        if self.fig is not None:
-            plt.close(self.fig)
-            self.canvas.get_tk_widget().destroy()
-        
-        # Create visualization
-        self.fig = plt.figure(figsize=(12, 8))
+        axes, ims = self.axes, self.ims
         
         # Original image
-        plt.subplot(2, 3, 1)
-        plt.title('Original Image')
-        plt.imshow(cv2.cvtColor(self.results['original'], cv2.COLOR_BGR2RGB))
-        plt.axis('off')
+        self.update_image(axes[0], ims[0], cv2.cvtColor(self.results['original'], cv2.COLOR_BGR2RGB),
+                          'Original Image')
         
         # Preprocessed image
-        plt.subplot(2, 3, 2)
-        plt.title('Preprocessed Image')
-        plt.imshow(self.results['preprocessed'], cmap='gray')
-        plt.axis('off')
+        self.update_image(axes[1], ims[1], self.results['preprocessed'], 'Preprocessed Image')
         
         # Edge detection
-        plt.subplot(2, 3, 3)
-        plt.title('Edge Detection')
-        plt.imshow(self.results['edges'], cmap='gray')
-        plt.axis('off')
+        self.update_image(axes[2], ims[2], self.results['edges'], 'Edge Detection')
         
         # Contour detection
-        plt.subplot(2, 3, 4)
-        plt.title('Contour Detection')
-        plt.imshow(cv2.cvtColor(self.results['contour_detection'], cv2.COLOR_BGR2RGB))
-        plt.axis('off')
+        self.update_image(axes[3], ims[3], cv2.cvtColor(self.results['contour_detection'], cv2.COLOR_BGR2RGB),
+                          'Contour Detection')
         
         # Best license plate (if found)
-        plt.subplot(2, 3, 5)
         if self.results['plate_regions'] and len(self.results['plate_regions']) > 0:
-            plt.title(f'Best Plate Region (Score: {self.results["plate_regions"][0][1]:.2f})')
-            plt.imshow(self.results['plate_regions'][0][0], cmap='gray')
+            self.update_image(axes[4], ims[4], self.results['plate_regions'][0][0],
+                              f'Best Plate Region (Score: {self.results["plate_regions"][0][1]:.2f})')
         else:
-            plt.title('No Plate Detected')
-        plt.axis('off')
+            ims[4].set_visible(False)
+            axes[4].set_title('No Plate Detected')
         
         # Final result
-        plt.subplot(2, 3, 6)
-        plt.title('Detection Result')
-        plt.imshow(cv2.cvtColor(self.results['result'], cv2.COLOR_BGR2RGB))
-        plt.axis('off')
+        self.update_image(axes[5], ims[5], cv2.cvtColor(self.results['result'], cv2.COLOR_BGR2RGB),
+                          'Detection Result')
         
-        plt.tight_layout()
+        self.fig.tight_layout()
         
         # Display in Tkinter
-        self.canvas = FigureCanvasTkAgg(self.fig, master=self.result_frame)
-        self.canvas.draw()
-        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.show_canvas(self.canvas)
 
 
 if __name__ == "__main__":
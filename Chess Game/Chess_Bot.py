@@ -1,10 +1,68 @@
 import chess
+import multiprocessing
+import os
 import random
+import time
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Optional
 
+# Transposition table entry flags: the stored value is exact, a lower bound
+# (search failed high) or an upper bound (search failed low)
+TT_EXACT = 0
+TT_LOWERBOUND = 1
+TT_UPPERBOUND = 2
+
+# Width of the null window used by principal variation search; smaller than
+# the evaluation granularity (1/100 of a pawn)
+NULL_WINDOW = 0.001
+
+# Simple opening book, keyed by the piece placement part of the FEN
+OPENING_BOOK = {
+    "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR": [
+        chess.Move.from_uci("e2e4"),  # King's pawn
+        chess.Move.from_uci("d2d4"),  # Queen's pawn
+        chess.Move.from_uci("g1f3"),  # King's knight
+    ],
+    "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR": [
+        chess.Move.from_uci("e7e5"),  # Open game
+        chess.Move.from_uci("c7c5"),  # Sicilian
+        chess.Move.from_uci("e7e6"),  # French
+    ]
+}
+
+# Bot owned by each root-search worker process (see _search_root_move)
+_worker_bot = None
+
+def _init_search_worker(max_depth):
+    """Create the per-process bot used by the root-search workers."""
+    global _worker_bot
+    _worker_bot = ChessBot(max_depth=max_depth, workers=1)
+
+def _search_root_move(board, move, depth, deadline, search_id):
+    """Score one root move in a worker process, or None once past the deadline."""
+    if time.time() > deadline:
+        return None
+    
+    # Keep the worker's transposition table for the whole search, not longer
+    if _worker_bot.search_count != search_id:
+        _worker_bot.transposition_table.clear()
+        _worker_bot.search_count = search_id
+    
+    board.push(move)
+    return _worker_bot.minimax_alpha_beta(board, depth, float('-inf'), float('inf'), False)
+
 class ChessBot:
-    def __init__(self, max_depth=3):  # Increased to 3 for better AI
+    def __init__(self, max_depth=3, workers=1):  # Increased to 3 for better AI
         self.max_depth = max_depth
+        
+        # Root moves can be searched in parallel worker processes (python-chess is
+        # pure Python, so threads would serialize on the GIL). Serial by default:
+        # pool startup and pickling eat into the short move budget, and only pay
+        # off with several real cores. None means one worker per core.
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.executor = None
+        self.search_count = 0
+        self.abort_requested = False
         self.piece_values = {
             chess.PAWN: 100,
             chess.KNIGHT: 320,
@@ -48,6 +106,45 @@ class ChessBot:
             -20,-10,-10,-10,-10,-10,-10,-20
         ]
         
+        # Rooks belong on the centre files, queens near the centre of the board
+        rook_table = [10 if chess.square_file(sq) in (2, 3, 4, 5) else 0 for sq in chess.SQUARES]
+        queen_table = [
+            int((8 - (abs(3.5 - chess.square_file(sq)) + abs(3.5 - chess.square_rank(sq)))) * 5)
+            for sq in chess.SQUARES
+        ]
+        king_table = [0] * 64
+        
+        # Piece-square tables indexed by piece type (chess.PAWN..chess.KING),
+        # with black's tables pre-mirrored so lookups need no color branch
+        self.pst_white = [None, self.pawn_table, self.knight_table, self.bishop_table,
+                          rook_table, queen_table, king_table]
+        self.pst_black = [None] + [
+            [table[chess.square_mirror(sq)] for sq in chess.SQUARES]
+            for table in self.pst_white[1:]
+        ]
+        
+        # (piece, material value, sign, piece-square table) for every piece
+        # kind, used to walk the per-piece bitboards in evaluate_board
+        self.piece_list = [
+            (chess.Piece(piece_type, color), value, 1 if color == chess.WHITE else -1,
+             (self.pst_white if color == chess.WHITE else self.pst_black)[piece_type])
+            for piece_type, value in self.piece_values.items()
+            for color in chess.COLORS
+        ]
+        
+        # Passed-pawn masks: the pawn's file and both neighbouring files,
+        # on every rank in front of the pawn (from that side's point of view)
+        self.white_passed_mask = [0] * 64
+        self.black_passed_mask = [0] * 64
+        for square in chess.SQUARES:
+            file = chess.square_file(square)
+            rank = chess.square_rank(square)
+            for f in range(max(0, file - 1), min(7, file + 1) + 1):
+                for r in range(rank + 1, 8):
+                    self.white_passed_mask[square] |= chess.BB_SQUARES[chess.square(f, r)]
+                for r in range(0, rank):
+                    self.black_passed_mask[square] |= chess.BB_SQUARES[chess.square(f, r)]
+        
         # Transposition table for caching evaluations
         self.transposition_table = {}
         self.nodes_searched = 0
@@ -60,22 +157,20 @@ class ChessBot:
             return 0
         
         score = 0
-        piece_map = board.piece_map()
         
-        # Material evaluation with positional bonuses
-        for square, piece in piece_map.items():
-            value = self.piece_values[piece.piece_type]
+        # Material evaluation with positional bonuses, straight from the bitboards
+        for piece, value, sign, table in self.piece_list:
+            bitboard = board.pieces_mask(piece.piece_type, piece.color)
+            if not bitboard:
+                continue
             
-            # Add positional bonus
-            positional_bonus = self.get_positional_bonus(piece, square)
-            
-            if piece.color == chess.WHITE:
-                score += value + positional_bonus
-            else:
-                score -= value + positional_bonus
+            score += sign * value * chess.popcount(bitboard)
+            for square in chess.scan_forward(bitboard):
+                score += sign * table[square]
         
-        # Mobility (simple count of legal moves)
-        mobility = board.legal_moves.count()
+        # Mobility (count of pseudo-legal moves; skipping the legality check
+        # is much cheaper and precise enough for a heuristic term)
+        mobility = board.pseudo_legal_moves.count()
         if board.turn == chess.WHITE:
             score += mobility * 5
         else:
@@ -88,103 +183,53 @@ class ChessBot:
 
     def get_positional_bonus(self, piece: chess.Piece, square: chess.Square) -> int:
         """Fast positional bonus using piece-square tables."""
-        # Mirror square for black pieces
-        if piece.color == chess.BLACK:
-            square = chess.square_mirror(square)
-        
-        if piece.piece_type == chess.PAWN:
-            return self.pawn_table[square]
-        elif piece.piece_type == chess.KNIGHT:
-            return self.knight_table[square]
-        elif piece.piece_type == chess.BISHOP:
-            return self.bishop_table[square]
-        elif piece.piece_type == chess.ROOK:
-            # Rooks belong on open files
-            file = chess.square_file(square)
-            # Simple bonus for center files
-            if file in [2, 3, 4, 5]:
-                return 10
-            return 0
-        elif piece.piece_type == chess.QUEEN:
-            # Queens belong in center
-            file = chess.square_file(square)
-            rank = chess.square_rank(square)
-            center_distance = abs(3.5 - file) + abs(3.5 - rank)
-            return int((8 - center_distance) * 5)
-        
-        return 0
+        tables = self.pst_white if piece.color == chess.WHITE else self.pst_black
+        return tables[piece.piece_type][square]
 
     def evaluate_pawn_structure_simple(self, board: chess.Board) -> int:
         """Fast pawn structure evaluation."""
         score = 0
-        pawns = board.pieces(chess.PAWN, chess.WHITE)
+        white_pawns = board.pieces_mask(chess.PAWN, chess.WHITE)
+        black_pawns = board.pieces_mask(chess.PAWN, chess.BLACK)
         
-        for pawn in pawns:
-            # Bonus for passed pawns
-            file = chess.square_file(pawn)
-            rank = chess.square_rank(pawn)
-            
-            # Check if pawn is passed
-            is_passed = True
-            for f in [max(0, file-1), file, min(7, file+1)]:
-                for r in range(rank + 1, 8):
-                    test_square = chess.square(f, r)
-                    if board.piece_at(test_square) == chess.Piece(chess.PAWN, chess.BLACK):
-                        is_passed = False
-                        break
-                if not is_passed:
-                    break
-            
-            if is_passed:
-                score += (rank * 10)  # Further advanced = better
+        # Bonus for passed pawns: no enemy pawn ahead on the same or adjacent files
+        for pawn in chess.scan_forward(white_pawns):
+            if not self.white_passed_mask[pawn] & black_pawns:
+                score += (chess.square_rank(pawn) * 10)  # Further advanced = better
         
         # Do the same for black pawns
-        black_pawns = board.pieces(chess.PAWN, chess.BLACK)
-        for pawn in black_pawns:
-            file = chess.square_file(pawn)
-            rank = chess.square_rank(pawn)
-            
-            is_passed = True
-            for f in [max(0, file-1), file, min(7, file+1)]:
-                for r in range(0, rank):
-                    test_square = chess.square(f, r)
-                    if board.piece_at(test_square) == chess.Piece(chess.PAWN, chess.WHITE):
-                        is_passed = False
-                        break
-                if not is_passed:
-                    break
-            
-            if is_passed:
-                score -= ((7 - rank) * 10)  # Further advanced = better for black
+        for pawn in chess.scan_forward(black_pawns):
+            if not self.black_passed_mask[pawn] & white_pawns:
+                score -= ((7 - chess.square_rank(pawn)) * 10)  # Further advanced = better for black
         
         return score
 
     def order_moves_fast(self, board: chess.Board, moves: List[chess.Move]) -> List[chess.Move]:
         """Fast move ordering for alpha-beta pruning."""
         move_scores = []
+        piece_values = self.piece_values
+        piece_at = board.piece_at
         
         for move in moves:
             score = 0
             
             # MVV-LVA (Most Valuable Victim - Least Valuable Aggressor)
             if board.is_capture(move):
-                victim = board.piece_at(move.to_square)
-                aggressor = board.piece_at(move.from_square)
+                victim = piece_at(move.to_square)
+                aggressor = piece_at(move.from_square)
                 
                 if victim and aggressor:
-                    victim_value = self.piece_values[victim.piece_type]
-                    aggressor_value = self.piece_values[aggressor.piece_type]
+                    victim_value = piece_values[victim.piece_type]
+                    aggressor_value = piece_values[aggressor.piece_type]
                     score = victim_value - aggressor_value + 1000  # Captures get high priority
             
             # Promotion moves
             if move.promotion:
                 score += 900  # Just below queen capture
             
-            # Killer heuristic: moves that cause checks
-            board.push(move)
-            if board.is_check():
+            # Killer heuristic: moves that cause checks (no make/unmake needed)
+            if board.gives_check(move):
                 score += 50
-            board.pop()
             
             move_scores.append((score, move))
         
@@ -194,55 +239,155 @@ class ChessBot:
 
     def minimax_alpha_beta(self, board: chess.Board, depth: int, alpha: float, 
                           beta: float, maximizing_player: bool) -> float:
-        """Minimax with alpha-beta pruning (optimized)."""
+        """Minimax with alpha-beta pruning and a transposition table."""
         self.nodes_searched += 1
         
+        # Probe the transposition table; the side being maximized is part of
+        # the key since it decides how terminal positions are scored
+        key = (board._transposition_key(), maximizing_player)
+        entry = self.transposition_table.get(key)
+        tt_move = None
+        if entry is not None:
+            entry_depth, flag, value, tt_move = entry
+            if entry_depth >= depth:
+                if flag == TT_EXACT:
+                    return value
+                elif flag == TT_LOWERBOUND:
+                    alpha = max(alpha, value)
+                elif flag == TT_UPPERBOUND:
+                    beta = min(beta, value)
+                if alpha >= beta:
+                    return value
+        
         # Return early conditions
         if depth == 0:
-            return self.evaluate_board(board)
+            value = self.evaluate_board(board)
+            self.transposition_table[key] = (depth, TT_EXACT, value, None)
+            return value
         
         if board.is_game_over():
             if board.is_checkmate():
-                return -100000 if maximizing_player else 100000
-            return 0
+                value = -100000 if maximizing_player else 100000
+            else:
+                value = 0
+            self.transposition_table[key] = (depth, TT_EXACT, value, None)
+            return value
         
-        # Get and order moves
+        # Get and order moves, trying the stored best move first
         legal_moves = list(board.legal_moves)
         legal_moves = self.order_moves_fast(board, legal_moves)
+        if tt_move is not None and tt_move in legal_moves:
+            legal_moves.remove(tt_move)
+            legal_moves.insert(0, tt_move)
         
+        # Window actually searched, used to classify the result below
+        alpha_orig, beta_orig = alpha, beta
+        best_move = None
+        
+        # Principal variation search: the first (best ordered) move gets the
+        # full window, the rest a null window that only proves they are no
+        # better; a move that does beat the bound is re-searched in full
         if maximizing_player:
-            max_eval = float('-inf')
-            for move in legal_moves:
+            best_eval = float('-inf')
+            for i, move in enumerate(legal_moves):
                 board.push(move)
-                eval_score = self.minimax_alpha_beta(board, depth - 1, alpha, beta, False)
+                if i == 0 or alpha == float('-inf'):
+                    eval_score = self.minimax_alpha_beta(board, depth - 1, alpha, beta, False)
+                else:
+                    eval_score = self.minimax_alpha_beta(board, depth - 1, alpha, alpha + NULL_WINDOW, False)
+                    if alpha < eval_score < beta:
+                        eval_score = self.minimax_alpha_beta(board, depth - 1, alpha, beta, False)
                 board.pop()
                 
-                max_eval = max(max_eval, eval_score)
+                if eval_score > best_eval:
+                    best_eval = eval_score
+                    best_move = move
                 alpha = max(alpha, eval_score)
                 
                 # Alpha-beta pruning
                 if beta <= alpha:
                     break
-            return max_eval
         else:
-            min_eval = float('inf')
-            for move in legal_moves:
+            best_eval = float('inf')
+            for i, move in enumerate(legal_moves):
                 board.push(move)
-                eval_score = self.minimax_alpha_beta(board, depth - 1, alpha, beta, True)
+                if i == 0 or beta == float('inf'):
+                    eval_score = self.minimax_alpha_beta(board, depth - 1, alpha, beta, True)
+                else:
+                    eval_score = self.minimax_alpha_beta(board, depth - 1, beta - NULL_WINDOW, beta, True)
+                    if alpha < eval_score < beta:
+                        eval_score = self.minimax_alpha_beta(board, depth - 1, alpha, beta, True)
                 board.pop()
                 
-                min_eval = min(min_eval, eval_score)
+                if eval_score < best_eval:
+                    best_eval = eval_score
+                    best_move = move
                 beta = min(beta, eval_score)
                 
                 # Alpha-beta pruning
                 if beta <= alpha:
                     break
-            return min_eval
+        
+        # Store the result with the bound it represents
+        if best_eval <= alpha_orig:
+            flag = TT_UPPERBOUND
+        elif best_eval >= beta_orig:
+            flag = TT_LOWERBOUND
+        else:
+            flag = TT_EXACT
+        self.transposition_table[key] = (depth, flag, best_eval, best_move)
+        
+        return best_eval
+
+    def search_root_moves(self, board: chess.Board, moves: List[chess.Move], depth: int,
+                          deadline: float) -> Optional[List[float]]:
+        """Score each root move to the given depth, or None if time ran out."""
+        if self.workers <= 1:
+            values = []
+            for move in moves:
+                # Check time limit (and whether the game is quitting)
+                if self.abort_requested or time.time() > deadline:
+                    return None
+                
+                board.push(move)
+                values.append(self.minimax_alpha_beta(board, depth, float('-inf'), float('inf'), False))
+                board.pop()
+            return values
+        
+        # Subtrees below the root moves are independent: search them in parallel
+        if self.executor is None:
+            # Spawn instead of fork: the bot usually runs on a thread of a
+            # multithreaded (pygame/SDL) process, which is unsafe to fork
+            self.executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                mp_context=multiprocessing.get_context("spawn"),
+                                                initializer=_init_search_worker,
+                                                initargs=(self.max_depth,))
+        
+        futures = [
+            self.executor.submit(_search_root_move, board.copy(), move, depth, deadline, self.search_count)
+            for move in moves
+        ]
+        values = [future.result() for future in futures]
+        if None in values:
+            return None
+        return values
+
+    def abort_search(self):
+        """Make a running search return its best move so far; used when the game quits.
+
+        Only affects the search in progress: the next search starts fresh (and
+        recreates the worker pool if one is used).
+        """
+        self.abort_requested = True
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
 
     def get_best_move_fast(self, board: chess.Board, time_limit: float = 2.0) -> Optional[chess.Move]:
         """Fast move selection with iterative deepening and time limit."""
-        import time
         start_time = time.time()
+        deadline = start_time + time_limit
+        self.abort_requested = False  # An abort only applies to the search it interrupted
         
         best_move = None
         legal_moves = list(board.legal_moves)
@@ -259,6 +404,10 @@ class ChessBot:
         if opening_move:
             return opening_move
         
+        # Start every search with an empty transposition table so it stays bounded
+        self.transposition_table.clear()
+        self.search_count += 1
+        
         # Order moves once at the beginning
         legal_moves = self.order_moves_fast(board, legal_moves)
         
@@ -270,19 +419,23 @@ class ChessBot:
             # Reset node count for this depth
             self.nodes_searched = 0
             
-            for move in legal_moves:
-                # Check time limit
-                if time.time() - start_time > time_limit:
-                    return best_move if best_move else legal_moves[0]
-                
-                board.push(move)
-                value = self.minimax_alpha_beta(board, depth - 1, float('-inf'), float('inf'), False)
-                board.pop()
-                
+            values = self.search_root_moves(board, legal_moves, depth - 1, deadline)
+            if values is None:
+                return best_move if best_move else legal_moves[0]
+            
+            # Root move values at this depth, used to order the next iteration
+            root_scores = list(zip(values, legal_moves))
+            
+            for value, move in root_scores:
                 if value > current_best_value:
                     current_best_value = value
                     current_best = move
             
+            # Search the best moves of this depth first on the next iteration
+            # (stable sort, so ties keep their previous order)
+            root_scores.sort(reverse=True, key=lambda x: x[0])
+            legal_moves = [move for _, move in root_scores]
+            
             # Update overall best move
             if current_best:
                 best_move = current_best
@@ -300,25 +453,13 @@ class ChessBot:
 
     def get_opening_move(self, board: chess.Board) -> Optional[chess.Move]:
         """Simple opening book for common openings."""
-        opening_moves = {
-            "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1": [
-                chess.Move.from_uci("e2e4"),  # King's pawn
-                chess.Move.from_uci("d2d4"),  # Queen's pawn
-                chess.Move.from_uci("g1f3"),  # King's knight
-            ],
-            "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1": [
-                chess.Move.from_uci("e7e5"),  # Open game
-                chess.Move.from_uci("c7c5"),  # Sicilian
-                chess.Move.from_uci("e7e6"),  # French
-            ]
-        }
+        moves = OPENING_BOOK.get(board.board_fen())  # Position part of the FEN only
+        if moves is None:
+            return None
         
-        fen = board.fen().split(' ')[0]  # Get position part of FEN
-        if fen in opening_moves:
-            moves = opening_moves[fen]
-            for move in moves:
-                if move in board.legal_moves:
-                    return move
+        for move in moves:
+            if move in board.legal_moves:
+                return move
         
         return None
 
@@ -1,10 +1,11 @@
 import pygame
 import chess
-import time
+import numpy as np
 import sys
 import os
 from typing import Optional, Tuple, List, Dict
-import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
 
 # Try to import the bot
 try:
@@ -20,17 +21,37 @@ except ImportError:
             legal_moves = list(board.legal_moves)
             return random.choice(legal_moves) if legal_moves else None
 
+# Unicode glyphs drawn on fallback pieces when an image is missing
+PIECE_LETTERS = {
+    'P': '♙', 'p': '♟',
+    'R': '♖', 'r': '♜',
+    'N': '♘', 'n': '♞',
+    'B': '♗', 'b': '♝',
+    'Q': '♕', 'q': '♛',
+    'K': '♔', 'k': '♚'
+}
+
+@lru_cache(maxsize=None)
+def piece_font(size: int) -> pygame.font.Font:
+    """Font for fallback piece glyphs, looked up once per size."""
+    try:
+        return pygame.font.SysFont('segoeuisymbol', size)
+    except:
+        return pygame.font.SysFont('arial', size)
+
 class GameState:
     """Encapsulates all game state to avoid global variables."""
     def __init__(self):
         self.board = chess.Board()
         self.bot = ChessBot(max_depth=3)  # Increased to 3 for better AI
         self.move_history: List[str] = []
+        self.move_history_surfaces: List[pygame.Surface] = []  # Rendered move_history entries
         self.player_color = chess.WHITE
         
         # UI state
         self.selected_square: Optional[chess.Square] = None
-        self.check_message_time: float = 0
+        self.selected_targets: Optional[List[chess.Square]] = None  # Legal destinations of selected_square
+        self.show_check = False  # Updated after each move, not every frame
         self.last_mover: Optional[str] = None
         
         # Animation
@@ -38,8 +59,7 @@ class GameState:
         
         # Bot thinking
         self.bot_thinking = False
-        self.bot_move_result = None
-        self.bot_thread = None
+        self.bot_future: Optional[Future] = None
         
         # Endgame 5-move rule tracking (FIXED: Issue #1)
         self.endgame_mode: Optional[str] = None
@@ -75,16 +95,38 @@ class ChessGUI:
         self.OVERLAY = (0, 0, 0, 180)
         self.BLUE = (0, 100, 200)  # For player labels
         
+        self.LAST_MOVE = (255, 255, 0, 80)
+        
         # ==========================
         # LOAD BACKGROUND TEXTURE (From Previous)
         # ==========================
         self.background = self.load_background()
         
+        # ==========================
+        # PRE-RENDERED BOARD & HIGHLIGHTS
+        # ==========================
+        self.board_surface = self.build_board_surface()
+        self.highlight_surfaces = {
+            color: self.build_highlight_surface(color)
+            for color in (self.HIGHLIGHT, self.SELECTED, self.LAST_MOVE)
+        }
+        
         # ==========================
         # LOAD PIECES (From Previous)
         # ==========================
-        self.pieces = self.load_pieces()
         self.PIECE_SCALE = 0.95
+        self.pieces = self.load_pieces()
+        
+        # ==========================
+        # PER-SQUARE PIXEL TABLES
+        # ==========================
+        # Top-left corner of every square, and where a centred piece image goes
+        self.square_xy = [
+            ((sq % 8) * self.SQUARE_SIZE, (7 - sq // 8) * self.SQUARE_SIZE)
+            for sq in chess.SQUARES
+        ]
+        piece_offset = self.SQUARE_SIZE // 2 - int(self.SQUARE_SIZE * self.PIECE_SCALE) // 2
+        self.piece_xy = [(x + piece_offset, y + piece_offset) for x, y in self.square_xy]
         
         # Game state
         self.state = GameState()
@@ -94,13 +136,36 @@ class ChessGUI:
         self.animation_data = None
         self.animation_progress = 0
         self.animation_speed = 15  # Animation steps
+        # Smoothstep easing for every animation step, so drawing just indexes it
+        self.animation_easing = [
+            t * t * (3 - 2 * t)
+            for t in (step / self.animation_speed for step in range(self.animation_speed + 1))
+        ]
         
         # Clock for FPS control
         self.clock = pygame.time.Clock()
         self.fps = 60
         
+        # One long-lived worker thread runs every bot search
+        self.bot_executor = ThreadPoolExecutor(max_workers=1)
+        self.searching_bot = None  # Bot whose search was submitted last (may outlive a reset)
+        
+        # Set whenever something on screen changes; idle frames skip drawing
+        self.dirty = True
+        
         # Load fonts
         self.fonts = self.load_fonts()
+        self.text_cache: Dict[tuple, pygame.Surface] = {}
+        
+        # Static move history panel (background + title)
+        self.panel_surface = self.build_panel_surface()
+        
+        # Every turn indicator the status line can show
+        self.turn_labels = {
+            'thinking': self.render_text("AI THINKING...", 'normal', self.GREEN),
+            'human': self.render_text("YOUR TURN (White)", 'normal', self.BLACK),
+            'ai': self.render_text("AI'S TURN (Black)", 'normal', self.BLACK),
+        }
     
     # ==========================
     # RESOURCE LOADING FUNCTIONS (From Previous)
@@ -114,15 +179,48 @@ class ChessGUI:
         except:
             pass
         
-        # Create gradient background as fallback
+        # Create gradient background as fallback, filled as one NumPy array
+        rows = np.arange(self.HEIGHT)
+        gradient = np.empty((self.WIDTH, self.HEIGHT, 3), dtype=np.uint8)
+        gradient[..., 0] = 40 + rows // 10
+        gradient[..., 1] = 60 + rows // 8
+        gradient[..., 2] = 80 + rows // 6
+        
         background = pygame.Surface((self.WIDTH, self.HEIGHT))
-        for i in range(self.HEIGHT):
-            color = (40 + i//10, 60 + i//8, 80 + i//6)
-            pygame.draw.line(background, color, (0, i), (self.WIDTH, i))
-        return background
+        pygame.surfarray.blit_array(background, gradient)
+        return background.convert()
+    
+    def build_board_surface(self):
+        """Render the static checkerboard once; draw_board just blits it."""
+        surface = pygame.Surface((self.BOARD_SIZE, self.BOARD_SIZE))
+        pygame.draw.rect(surface, self.BOARD_OUTLINE, (0, 0, self.BOARD_SIZE, self.BOARD_SIZE), 6)
+        for row in range(8):
+            for col in range(8):
+                color = self.WHITE if (row + col) % 2 == 0 else self.BROWN
+                pygame.draw.rect(
+                    surface, color,
+                    (col * self.SQUARE_SIZE, row * self.SQUARE_SIZE,
+                     self.SQUARE_SIZE, self.SQUARE_SIZE)
+                )
+        return surface.convert()
+    
+    def build_panel_surface(self):
+        """Render the move history panel background and title once."""
+        surface = pygame.Surface((260, 700))
+        surface.fill(self.PANEL_BG)
+        surface.blit(self.render_text("Move History", 'title', self.BLACK), (20, 20))
+        return surface.convert()
+    
+    def build_highlight_surface(self, color: Tuple[int, int, int, int]):
+        """Create a translucent square-sized surface filled with color."""
+        s = pygame.Surface((self.SQUARE_SIZE, self.SQUARE_SIZE), pygame.SRCALPHA)
+        s.fill(color)
+        return s.convert_alpha()
     
     def load_pieces(self):
-        """Load piece images exactly like previous code."""
+        """Load piece images, pre-scaled once to their on-board size."""
+        new_size = int(self.SQUARE_SIZE * self.PIECE_SCALE)
+        
         def load_piece(path):
             try:
                 if os.path.exists(path):
@@ -130,6 +228,8 @@ class ChessGUI:
                     # Get bounding rect and crop like previous code
                     rect = img.get_bounding_rect()
                     img = img.subsurface(rect).copy()
+                    # Scale here instead of on every frame
+                    img = pygame.transform.smoothscale(img, (new_size, new_size)).convert_alpha()
                     return img
                 else:
                     raise FileNotFoundError
@@ -193,26 +293,12 @@ class ChessGUI:
         pygame.draw.circle(surface, outline_color, (size//2, size//2), size//2 - 5, 2)
         
         # Add piece letter
-        piece_letters = {
-            'P': '♙', 'p': '♟',
-            'R': '♖', 'r': '♜',
-            'N': '♘', 'n': '♞',
-            'B': '♗', 'b': '♝',
-            'Q': '♕', 'q': '♛',
-            'K': '♔', 'k': '♚'
-        }
-        
-        letter = piece_letters.get(piece_type, '?')
-        try:
-            font = pygame.font.SysFont('segoeuisymbol', size//2)
-        except:
-            font = pygame.font.SysFont('arial', size//2)
-        
-        text = font.render(letter, True, outline_color)
+        letter = PIECE_LETTERS.get(piece_type, '?')
+        text = piece_font(size//2).render(letter, True, outline_color)
         text_rect = text.get_rect(center=(size//2, size//2))
         surface.blit(text, text_rect)
         
-        return surface
+        return surface.convert_alpha()
     
     def load_fonts(self):
         """Load fonts with fallbacks."""
@@ -236,12 +322,22 @@ class ChessGUI:
         
         return fonts
     
+    def render_text(self, text: str, font_key: str, color) -> pygame.Surface:
+        """Render text with a cached surface per (text, font, color)."""
+        key = (text, font_key, color)
+        surface = self.text_cache.get(key)
+        if surface is None:
+            surface = self.fonts[font_key].render(text, True, color).convert_alpha()
+            self.text_cache[key] = surface
+        return surface
+    
     def reset_game(self):
         """Reset the game to initial state (FIXED: Issue #6)."""
         # Create a completely new game state
         self.state = GameState()
         self.last_move = None
         self.animation_data = None
+        self.dirty = True
     
     # ==========================
     # DRAWING FUNCTIONS
@@ -251,90 +347,59 @@ class ChessGUI:
         self.WINDOW.blit(self.background, (0, 0))
     
     def draw_board(self):
-        """Draw the chess board exactly like previous code."""
-        pygame.draw.rect(self.WINDOW, self.BOARD_OUTLINE, (0, 0, self.BOARD_SIZE, self.BOARD_SIZE), 6)
-        for row in range(8):
-            for col in range(8):
-                color = self.WHITE if (row + col) % 2 == 0 else self.BROWN
-                pygame.draw.rect(
-                    self.WINDOW, color,
-                    (col * self.SQUARE_SIZE, row * self.SQUARE_SIZE,
-                     self.SQUARE_SIZE, self.SQUARE_SIZE)
-                )
+        """Draw the pre-rendered chess board."""
+        self.WINDOW.blit(self.board_surface, (0, 0))
         
         # Highlight last move
         if self.last_move:
             from_sq, to_sq = self.last_move
-            self.highlight_square(from_sq, (255, 255, 0, 80))
-            self.highlight_square(to_sq, (255, 255, 0, 80))
+            self.highlight_square(from_sq, self.LAST_MOVE)
+            self.highlight_square(to_sq, self.LAST_MOVE)
     
     def draw_pieces(self, exclude_square: Optional[chess.Square] = None):
-        """Draw all pieces on the board exactly like previous code."""
-        for square in chess.SQUARES:
+        """Draw all pieces on the board in a single batched blit."""
+        blit_sequence = []
+        # piece_map only holds occupied squares, so empty squares cost nothing
+        for square, piece in self.state.board.piece_map().items():
             # Skip the piece being animated
             if self.animation_data and square == self.animation_data['from_sq']:
                 continue
                 
-            piece = self.state.board.piece_at(square)
-            if piece:
-                row = 7 - (square // 8)
-                col = square % 8
-
-                img = self.pieces[piece.symbol()]
-                new_size = int(self.SQUARE_SIZE * self.PIECE_SCALE)
-                scaled_img = pygame.transform.smoothscale(img, (new_size, new_size))
-
-                center_x = col * self.SQUARE_SIZE + (self.SQUARE_SIZE // 2)
-                center_y = row * self.SQUARE_SIZE + (self.SQUARE_SIZE // 2)
-
-                draw_x = center_x - (new_size // 2)
-                draw_y = center_y - (new_size // 2)
-
-                self.WINDOW.blit(scaled_img, (draw_x, draw_y))
+            blit_sequence.append((self.pieces[piece.symbol()], self.piece_xy[square]))
+        
+        self.WINDOW.blits(blit_sequence, doreturn=False)
     
     def draw_animated_piece(self):
         """Draw the piece being animated."""
         if self.animation_data:
-            t = self.animation_progress / self.animation_speed
             # Use easing for smoother animation
-            eased_t = t * t * (3 - 2 * t)
+            eased_t = self.animation_easing[self.animation_progress]
             
             from_sq = self.animation_data['from_sq']
             to_sq = self.animation_data['to_sq']
             piece_symbol = self.animation_data['piece_symbol']
             
-            from_row = 7 - (from_sq // 8)
-            from_col = from_sq % 8
-            to_row = 7 - (to_sq // 8)
-            to_col = to_sq % 8
-            
-            start_x = from_col * self.SQUARE_SIZE
-            start_y = from_row * self.SQUARE_SIZE
-            end_x = to_col * self.SQUARE_SIZE
-            end_y = to_row * self.SQUARE_SIZE
+            start_x, start_y = self.square_xy[from_sq]
+            end_x, end_y = self.square_xy[to_sq]
             
             x = start_x + (end_x - start_x) * eased_t
             y = start_y + (end_y - start_y) * eased_t
             
-            img = self.pieces[piece_symbol]
-            new_size = int(self.SQUARE_SIZE * self.PIECE_SCALE)
-            scaled_img = pygame.transform.smoothscale(img, (new_size, new_size))
-            
-            self.WINDOW.blit(scaled_img, (x, y))
+            self.WINDOW.blit(self.pieces[piece_symbol], (x, y))
     
     def highlight_square(self, square: chess.Square, color: Tuple[int, int, int, int]):
-        """Highlight a square on the board exactly like previous code."""
-        row = 7 - (square // 8)
-        col = square % 8
-        s = pygame.Surface((self.SQUARE_SIZE, self.SQUARE_SIZE), pygame.SRCALPHA)
-        s.fill(color)
-        self.WINDOW.blit(s, (col * self.SQUARE_SIZE, row * self.SQUARE_SIZE))
+        """Highlight a square on the board using the pre-built overlay."""
+        s = self.highlight_surfaces.get(color)
+        if s is None:
+            # First use of a colour outside the pre-built set
+            s = self.highlight_surfaces[color] = self.build_highlight_surface(color)
+        self.WINDOW.blit(s, self.square_xy[square])
     
     def draw_labels(self):
         """Draw turn indicator (FIXED: Issue #5 - Add player labels)."""
         # Draw player labels on board
-        human_label = self.fonts['small_bold'].render("HUMAN", True, self.BLUE)
-        ai_label = self.fonts['small_bold'].render("AI", True, self.RED)
+        human_label = self.render_text("HUMAN", 'small_bold', self.BLUE)
+        ai_label = self.render_text("AI", 'small_bold', self.RED)
         
         # Draw HUMAN on left side (White pieces at bottom)
         self.WINDOW.blit(human_label, (10, self.BOARD_SIZE - 40))
@@ -344,52 +409,38 @@ class ChessGUI:
         
         # Draw turn indicator
         if self.state.bot_thinking:
-            text = "AI THINKING..."
-            color = self.GREEN
+            key = 'thinking'
+        elif self.state.board.turn == self.state.player_color:
+            key = 'human'
         else:
-            if self.state.board.turn == self.state.player_color:
-                text = "YOUR TURN (White)"
-                color = self.BLACK
-            else:
-                text = "AI'S TURN (Black)"
-                color = self.BLACK
+            key = 'ai'
         
-        turn_label = self.fonts['normal'].render(text, True, color)
-        self.WINDOW.blit(turn_label, (20, 650))
+        self.WINDOW.blit(self.turn_labels[key], (20, 650))
     
     def draw_game_status(self):
         """Draw check/checkmate status (FIXED: Issue #2 - Only show CHECK)."""
-        # Only show "CHECK!" message, not "CHECKMATE!"
-        if self.state.board.is_check() and not self.state.board.is_checkmate():
-            text = "CHECK!"
-            self.state.check_message_time = time.time()
-        else:
-            text = ""
-
-        if text and time.time() - self.state.check_message_time < 2.5:
-            label = self.fonts['large'].render(text, True, self.RED)
+        if self.state.show_check:
+            label = self.render_text("CHECK!", 'large', self.RED)
             self.WINDOW.blit(label, (300, 650))
     
     def draw_move_history(self):
         """Draw move history panel exactly like previous code."""
-        pygame.draw.rect(self.WINDOW, self.PANEL_BG, (640, 0, 260, 700))
-        title = self.fonts['title'].render("Move History", True, self.BLACK)
-        self.WINDOW.blit(title, (660, 20))
+        self.WINDOW.blit(self.panel_surface, (640, 0))
 
-        y_offset = 50
-        for move in self.state.move_history[-20:]:
-            text = self.fonts['small'].render(move, True, self.BLACK)
-            self.WINDOW.blit(text, (660, y_offset))
-            y_offset += 22
+        self.WINDOW.blits(
+            [(text, (660, 50 + i * 22))
+             for i, text in enumerate(self.state.move_history_surfaces[-20:])],
+            doreturn=False
+        )
     
     def draw_endgame_rules(self) -> bool:
         """Draw endgame 5-move rule (FIXED: Issue #1)."""
-        # Check for endgame conditions
-        white_pieces = [p for p in self.state.board.piece_map().values() if p.color == chess.WHITE]
-        black_pieces = [p for p in self.state.board.piece_map().values() if p.color == chess.BLACK]
-
-        white_only_king = all(p.piece_type == chess.KING for p in white_pieces)
-        black_only_king = all(p.piece_type == chess.KING for p in black_pieces)
+        # Check for endgame conditions: a side has only its king when no
+        # non-king bit is set in its occupancy mask
+        board = self.state.board
+        non_kings = ~board.kings
+        white_only_king = (board.occupied_co[chess.WHITE] & non_kings) == 0
+        black_only_king = (board.occupied_co[chess.BLACK] & non_kings) == 0
 
         # === CASE 2: BOTH SIDES HAVE ONLY KINGS ===
         if white_only_king and black_only_king:
@@ -399,7 +450,7 @@ class ChessGUI:
                 self.state.moves_left_black = 5
 
             text = f"Only Kings Left — White: {self.state.moves_left_white} moves | Black: {self.state.moves_left_black} moves"
-            label = self.fonts['small_bold'].render(text, True, self.RED)
+            label = self.render_text(text, 'small_bold', self.RED)
             self.WINDOW.blit(label, (60, 610))
 
             if self.state.moves_left_white <= 0 and self.state.moves_left_black <= 0:
@@ -424,7 +475,7 @@ class ChessGUI:
             else:
                 text = f"White has 5 moves to checkmate: {self.state.moves_left_white} left"
 
-            label = self.fonts['small_bold'].render(text, True, self.RED)
+            label = self.render_text(text, 'small_bold', self.RED)
             self.WINDOW.blit(label, (100, 610))
 
             if (white_only_king and self.state.moves_left_black <= 0) or \
@@ -441,10 +492,9 @@ class ChessGUI:
             # Highlight selected square
             self.highlight_square(self.state.selected_square, self.SELECTED)
             
-            # Highlight legal moves
-            for move in self.state.board.legal_moves:
-                if move.from_square == self.state.selected_square:
-                    self.highlight_square(move.to_square, self.HIGHLIGHT)
+            # Highlight legal moves (computed once when the piece was selected)
+            for target in self.state.selected_targets:
+                self.highlight_square(target, self.HIGHLIGHT)
     
     def draw(self):
         """Main draw function."""
@@ -482,9 +532,29 @@ class ChessGUI:
         row = y // self.SQUARE_SIZE
         return chess.square(col, 7 - row)
     
+    def select_square(self, square: Optional[chess.Square]):
+        """Select (or clear with None) a square and cache its legal move targets."""
+        self.state.selected_square = square
+        self.dirty = True
+        if square is None:
+            self.state.selected_targets = None
+        else:
+            self.state.selected_targets = [
+                move.to_square
+                for move in self.state.board.generate_legal_moves(from_mask=chess.BB_SQUARES[square])
+            ]
+    
     def add_move_to_history(self, move_san: str, player: str):
         """Add a move to the history."""
-        self.state.move_history.append(f"{player}: {move_san}")
+        entry = f"{player}: {move_san}"
+        self.state.move_history.append(entry)
+        self.state.move_history_surfaces.append(self.render_text(entry, 'small', self.BLACK))
+    
+    def update_check_status(self):
+        """Record whether the side to move is in check after a move."""
+        # Only show "CHECK!" message, not "CHECKMATE!"
+        board = self.state.board
+        self.state.show_check = board.is_check() and not board.is_checkmate()
     
     def update_endgame_move_counters(self):
         """Update endgame move counters after a move."""
@@ -508,11 +578,13 @@ class ChessGUI:
         }
         self.animation_progress = 0
         self.state.animating = True
+        self.dirty = True
     
     def update_animation(self):
         """Update animation progress."""
         if self.state.animating and self.animation_data:
             self.animation_progress += 1
+            self.dirty = True
             
             if self.animation_progress >= self.animation_speed:
                 # Animation complete
@@ -524,12 +596,25 @@ class ChessGUI:
         
         return False  # No animation
     
+    def quit_game(self):
+        """Close the window and exit from any screen without waiting out a bot search."""
+        # The executor's worker is joined at interpreter exit, so stop the search first
+        if self.searching_bot is not None:
+            self.searching_bot.abort_search()
+        self.bot_executor.shutdown(wait=False, cancel_futures=True)
+        pygame.quit()
+        sys.exit()
+    
+    def wait_events(self) -> List[pygame.event.Event]:
+        """Sleep until an event arrives, then return it with any others pending."""
+        return [pygame.event.wait()] + pygame.event.get()
+    
     def choose_promotion(self) -> chess.PieceType:
         """Show promotion menu exactly like previous code."""
-        font = self.fonts['title']
+        self.dirty = True  # Covers the board until the next full redraw
         options = ["Queen", "Rook", "Bishop", "Knight"]
 
-        self.WINDOW.blit(font.render("Choose Promotion:", True, self.BLACK), (200, 200))
+        self.WINDOW.blit(self.render_text("Choose Promotion:", 'title', self.BLACK), (200, 200))
 
         buttons = []
         x = 180
@@ -537,17 +622,16 @@ class ChessGUI:
             rect = pygame.Rect(x, 260, 120, 50)
             pygame.draw.rect(self.WINDOW, self.WHITE, rect)
             pygame.draw.rect(self.WINDOW, self.BLACK, rect, 2)
-            self.WINDOW.blit(font.render(opt, True, self.BLACK), (x + 10, 270))
+            self.WINDOW.blit(self.render_text(opt, 'title', self.BLACK), (x + 10, 270))
             buttons.append((rect, opt))
             x += 140
 
         pygame.display.update()
 
         while True:
-            for event in pygame.event.get():
+            for event in self.wait_events():
                 if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
+                    self.quit_game()
                 
                 if event.type == pygame.MOUSEBUTTONDOWN:
                     for rect, opt in buttons:
@@ -561,17 +645,15 @@ class ChessGUI:
     
     def show_draw_screen(self, reason: str):
         """Show draw result screen."""
-        font_big = self.fonts['large']
-        font_small = self.fonts['normal']
-
+        self.dirty = True  # Covers the board until the next full redraw
         overlay = pygame.Surface((self.WIDTH, self.HEIGHT), pygame.SRCALPHA)
         overlay.fill(self.OVERLAY)
         self.WINDOW.blit(overlay, (0, 0))
 
         title = "GAME DRAWN"
-        t1 = font_big.render(title, True, self.WHITE)
-        t2 = font_small.render(reason, True, self.WHITE)
-        t3 = font_small.render("Score: ½ - ½", True, self.WHITE)
+        t1 = self.render_text(title, 'large', self.WHITE)
+        t2 = self.render_text(reason, 'normal', self.WHITE)
+        t3 = self.render_text("Score: ½ - ½", 'normal', self.WHITE)
 
         self.WINDOW.blit(t1, (320, 200))
         self.WINDOW.blit(t2, (200, 270))
@@ -585,21 +667,19 @@ class ChessGUI:
         pygame.draw.rect(self.WINDOW, self.WHITE, new_rect)
         pygame.draw.rect(self.WINDOW, self.BLACK, new_rect, 2)
 
-        self.WINDOW.blit(font_small.render("CLOSE", True, self.BLACK), (300, 395))
-        self.WINDOW.blit(font_small.render("NEW GAME", True, self.BLACK), (500, 395))
+        self.WINDOW.blit(self.render_text("CLOSE", 'normal', self.BLACK), (300, 395))
+        self.WINDOW.blit(self.render_text("NEW GAME", 'normal', self.BLACK), (500, 395))
 
         pygame.display.update()
 
         while True:
-            for event in pygame.event.get():
+            for event in self.wait_events():
                 if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
+                    self.quit_game()
 
                 if event.type == pygame.MOUSEBUTTONDOWN:
                     if close_rect.collidepoint(event.pos):
-                        pygame.quit()
-                        sys.exit()
+                        self.quit_game()
 
                     if new_rect.collidepoint(event.pos):
                         self.reset_game()
@@ -607,9 +687,7 @@ class ChessGUI:
     
     def show_checkmate_screen(self, winner: str):
         """Show checkmate result screen exactly like previous code."""
-        font_big = self.fonts['large']
-        font_small = self.fonts['normal']
-
+        self.dirty = True  # Covers the board until the next full redraw
         overlay = pygame.Surface((self.WIDTH, self.HEIGHT), pygame.SRCALPHA)
         overlay.fill(self.OVERLAY)
         self.WINDOW.blit(overlay, (0, 0))
@@ -621,8 +699,8 @@ class ChessGUI:
             title = "CHECKMATE — AI WINS"
             score = "Human 0 : 1 AI"
 
-        t1 = font_big.render(title, True, self.WHITE)
-        t2 = font_small.render(score, True, self.WHITE)
+        t1 = self.render_text(title, 'large', self.WHITE)
+        t2 = self.render_text(score, 'normal', self.WHITE)
 
         self.WINDOW.blit(t1, (250, 220))
         self.WINDOW.blit(t2, (320, 270))
@@ -635,21 +713,19 @@ class ChessGUI:
         pygame.draw.rect(self.WINDOW, self.WHITE, new_rect)
         pygame.draw.rect(self.WINDOW, self.BLACK, new_rect, 2)
 
-        self.WINDOW.blit(font_small.render("CLOSE", True, self.BLACK), (300, 365))
-        self.WINDOW.blit(font_small.render("NEW GAME", True, self.BLACK), (500, 365))
+        self.WINDOW.blit(self.render_text("CLOSE", 'normal', self.BLACK), (300, 365))
+        self.WINDOW.blit(self.render_text("NEW GAME", 'normal', self.BLACK), (500, 365))
 
         pygame.display.update()
 
         while True:
-            for event in pygame.event.get():
+            for event in self.wait_events():
                 if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
+                    self.quit_game()
 
                 if event.type == pygame.MOUSEBUTTONDOWN:
                     if close_rect.collidepoint(event.pos):
-                        pygame.quit()
-                        sys.exit()
+                        self.quit_game()
 
                     if new_rect.collidepoint(event.pos):
                         self.reset_game()
@@ -657,11 +733,10 @@ class ChessGUI:
     
     def start_screen(self):
         """Show start screen exactly like previous code."""
-        font = self.fonts['button']
-
+        self.dirty = True  # Covers the board until the next full redraw
         self.WINDOW.blit(self.background, (0, 0))
-        text1 = font.render("White = HUMAN", True, self.BLACK)
-        text2 = font.render("Black = AI", True, self.BLACK)
+        text1 = self.render_text("White = HUMAN", 'button', self.BLACK)
+        text2 = self.render_text("Black = AI", 'button', self.BLACK)
         self.WINDOW.blit(text1, (330, 220))
         self.WINDOW.blit(text2, (350, 260))
 
@@ -669,15 +744,14 @@ class ChessGUI:
         pygame.draw.rect(self.WINDOW, self.WHITE, play_rect)
         pygame.draw.rect(self.WINDOW, self.BLACK, play_rect, 2)
 
-        play_text = font.render("PLAY", True, self.BLACK)
+        play_text = self.render_text("PLAY", 'button', self.BLACK)
         self.WINDOW.blit(play_text, (410, 365))
         pygame.display.update()
 
         while True:
-            for event in pygame.event.get():
+            for event in self.wait_events():
                 if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
+                    self.quit_game()
                 if event.type == pygame.MOUSEBUTTONDOWN:
                     if play_rect.collidepoint(event.pos):
                         return
@@ -690,14 +764,14 @@ class ChessGUI:
             
         square = self.get_square_from_pos(pos)
         if square is None:
-            self.state.selected_square = None
+            self.select_square(None)
             return False
         
         if self.state.selected_square is None:
             # Select a piece
             piece = self.state.board.piece_at(square)
             if piece and piece.color == self.state.player_color:
-                self.state.selected_square = square
+                self.select_square(square)
                 return False
         else:
             # Try to make a move
@@ -705,7 +779,7 @@ class ChessGUI:
             piece = self.state.board.piece_at(from_square)
             
             if not piece:
-                self.state.selected_square = None
+                self.select_square(None)
                 return False
             
             # Check if this is a pawn promotion (FIXED: Issue #3 - Check legality first)
@@ -718,14 +792,15 @@ class ChessGUI:
             # If pawn is moving to last rank, check if promotion is a legal option
             if is_pawn and ((piece.color == chess.WHITE and to_rank == 7) or 
                            (piece.color == chess.BLACK and to_rank == 0)):
-                # Check if promotion move is legal
-                for promo_piece in [chess.QUEEN, chess.ROOK, chess.BISHOP, chess.KNIGHT]:
-                    promo_move = chess.Move(from_square, square, promotion=promo_piece)
-                    if promo_move in self.state.board.legal_moves:
-                        # Show promotion menu since at least one promotion is legal
-                        promotion_piece = self.choose_promotion()
-                        move = chess.Move(from_square, square, promotion=promotion_piece)
-                        break
+                # Check if promotion move is legal (one generation pass limited to this from/to pair)
+                promo_moves = self.state.board.generate_legal_moves(
+                    from_mask=chess.BB_SQUARES[from_square],
+                    to_mask=chess.BB_SQUARES[square]
+                )
+                if any(promo_move.promotion for promo_move in promo_moves):
+                    # Show promotion menu since at least one promotion is legal
+                    promotion_piece = self.choose_promotion()
+                    move = chess.Move(from_square, square, promotion=promotion_piece)
             
             # Check if move is legal
             if move in self.state.board.legal_moves:
@@ -740,6 +815,7 @@ class ChessGUI:
                 
                 # Make move after animation
                 self.state.board.push(move)
+                self.update_check_status()
                 
                 # Add to history
                 self.add_move_to_history(move_san, "You")
@@ -751,30 +827,29 @@ class ChessGUI:
                 # Update endgame move counters
                 self.update_endgame_move_counters()
                 
-                self.state.selected_square = None
+                self.select_square(None)
                 return True
             
             # Invalid move, deselect
-            self.state.selected_square = None
+            self.select_square(None)
         
         return False
     
-    def bot_think_thread(self):
-        """Thread function for bot thinking."""
-        self.state.bot_move_result = self.state.bot.get_best_move(self.state.board)
-    
     def handle_bot_move(self):
         """Handle AI bot move (non-blocking)."""
         if not self.state.bot_thinking and self.state.board.turn != self.state.player_color:
-            # Start bot thinking in a thread
+            # Start bot thinking on the worker thread, on a copy so drawing
+            # never reads the board while the search pushes/pops moves
             self.state.bot_thinking = True
-            self.state.bot_thread = threading.Thread(target=self.bot_think_thread)
-            self.state.bot_thread.daemon = True
-            self.state.bot_thread.start()
+            self.dirty = True
+            self.searching_bot = self.state.bot
+            self.state.bot_future = self.bot_executor.submit(
+                self.state.bot.get_best_move, self.state.board.copy()
+            )
         
         # Check if bot has finished thinking
-        if self.state.bot_thinking and self.state.bot_move_result is not None:
-            bot_move = self.state.bot_move_result
+        if self.state.bot_thinking and self.state.bot_future.done():
+            bot_move = self.state.bot_future.result()
             
             if bot_move:
                 # Check if promotion is needed
@@ -799,6 +874,7 @@ class ChessGUI:
                 
                 # Make move
                 self.state.board.push(bot_move)
+                self.update_check_status()
                 
                 # Add to history
                 self.add_move_to_history(move_san, "AI")
@@ -812,8 +888,8 @@ class ChessGUI:
             
             # Reset bot state
             self.state.bot_thinking = False
-            self.state.bot_move_result = None
-            self.state.bot_thread = None
+            self.state.bot_future = None
+            self.dirty = True
     
     def run(self):
         """Main game loop."""
@@ -828,6 +904,9 @@ class ChessGUI:
                 if event.type == pygame.QUIT:
                     running = False
                 
+                if event.type == pygame.WINDOWEXPOSED:
+                    self.dirty = True
+                
                 if event.type == pygame.MOUSEBUTTONDOWN:
                     if self.state.board.turn == self.state.player_color and not self.state.animating:
                         if self.handle_human_move(pygame.mouse.get_pos()):
@@ -856,17 +935,18 @@ class ChessGUI:
                     else:
                         running = False
             
-            # Draw everything
-            if self.draw():  # Returns True if draw screen should be shown
-                if self.show_draw_screen("Endgame rule triggered"):
-                    self.start_screen()
-                else:
-                    running = False
-            
-            pygame.display.update()
+            # Draw everything (only when something changed since the last frame)
+            if self.dirty:
+                self.dirty = False
+                if self.draw():  # Returns True if draw screen should be shown
+                    if self.show_draw_screen("Endgame rule triggered"):
+                        self.start_screen()
+                    else:
+                        running = False
+                
+                pygame.display.update()
         
-        pygame.quit()
-        sys.exit()
+        self.quit_game()
 
 if __name__ == "__main__":
     game = ChessGUI()
@@ -1,30 +1,56 @@
-from PIL import Image, ImageDraw
+from PIL import Image
+import numpy as np
+import io
 import os
 
 INPUT_DIR = "images"
 if not os.path.exists(INPUT_DIR):
     os.makedirs(INPUT_DIR)
 
-def create_dummy_image(filename="dummy_face.jpg"):
+def create_dummy_image(filename="dummy_face.png"):
     """Creates a simple image with a black circle on a white background."""
-    img = Image.new('RGB', (400, 400), color = 'white')
-    d = ImageDraw.Draw(img)
-    # Draw a circle (face-like shape)
-    d.ellipse((100, 100, 300, 300), fill = 'black', outline ='black')
+    arr = np.full((400, 400, 3), 255, dtype=np.uint8)
+    # Draw a circle (face-like shape) as one vectorized mask
+    yy, xx = np.ogrid[:400, :400]
+    arr[(xx - 200) ** 2 + (yy - 200) ** 2 <= 100 ** 2] = 0
+    img = Image.fromarray(arr, 'RGB')
+    
+    # Encode once (uncompressed PNG, no DCT work); every copy reuses these bytes
+    buf = io.BytesIO()
+    img.save(buf, format="PNG", compress_level=0)
+    data = buf.getvalue()
     
     path = os.path.join(INPUT_DIR, filename)
-    img.save(path)
+    write_image(path, data)
     print(f"Created dummy image: {path}")
-    return path
+    return path, data
+
+def write_image(path, data):
+    """Writes already-encoded image bytes to path."""
+    with open(path, "wb") as f:
+        f.write(data)
+
+def link_image(base_path, new_path, data):
+    """Hard-links new_path to base_path, falling back to writing a copy."""
+    try:
+        if os.path.exists(new_path):
+            os.remove(new_path)
+        os.link(base_path, new_path)
+    except OSError:
+        # Filesystem without hard link support
+        write_image(new_path, data)
 
 def generate_test_images(count=10):
-    """Generates multiple copies of the dummy image for batch processing."""
-    base_path = create_dummy_image()
+    """Generates multiple copies of the dummy image for batch processing.
+    
+    The copies are hard links to one file, so they must not be edited in place.
+    """
+    base_path, data = create_dummy_image()
     
     for i in range(1, count + 1):
-        new_filename = f"test_image_{i}.jpg"
+        new_filename = f"test_image_{i}.png"
         new_path = os.path.join(INPUT_DIR, new_filename)
-        os.system(f"cp {base_path} {new_path}")
+        link_image(base_path, new_path, data)
         print(f"Generated test image: {new_path}")
 
 if __name__ == "__main__":
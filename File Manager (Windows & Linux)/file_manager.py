@@ -2,10 +2,16 @@ import streamlit as st
 import os
 import shutil
 import stat
+import errno
 import datetime
+import time
 import zipfile
 import platform
 import psutil
+import atexit
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 # ------------------ Setup ------------------
 st.set_page_config(
@@ -28,12 +34,49 @@ st.markdown(
 )
 
 HISTORY_FILE = "history.txt"
+HISTORY_FLUSH_SECONDS = 2  # Logged actions are batched and appended to the history file this often
+READ_AHEAD_LIMIT = 16 * 1024 * 1024  # Files up to this size are read ahead into memory when archiving
+READ_AHEAD_DEPTH = 16  # Number of files read concurrently
+READ_AHEAD_BUDGET = 64 * 1024 * 1024  # Most file data held in memory ahead of the archive writer
+# Formats that are already compressed; deflating them again only burns CPU
+COMPRESSED_EXTS = {'.png', '.jpg', '.jpeg', '.gif', '.webp', '.avif', '.mp3', '.mp4', '.mkv',
+                   '.zip', '.gz', '.bz2', '.xz', '.7z', '.rar', '.docx', '.xlsx', '.pptx'}
+CPU_SAMPLE_MIN_SECONDS = 0.5  # Shortest interval that gives a meaningful CPU usage figure
+
+@st.cache_resource
+def cpu_percent_baseline():
+    """First non-blocking cpu_percent call only sets the baseline; make it once per process and note when"""
+    psutil.cpu_percent(interval=None)
+    return time.monotonic()
+
+# Start the CPU measurement interval as early as possible
+cpu_percent_baseline()
 
 # ------------------ Utility Functions ------------------
+@st.cache_resource
+def history_buffer():
+    """Pending history lines, shared across reruns and flushed on exit"""
+    buffer = {"lines": [], "lock": threading.Lock(), "timer": None}
+    atexit.register(flush_history, buffer)
+    return buffer
+
+def flush_history(buffer):
+    """Append all pending history lines in one write"""
+    with buffer["lock"]:
+        lines, buffer["lines"], buffer["timer"] = buffer["lines"], [], None
+        if lines:
+            with open(HISTORY_FILE, "a") as f:
+                f.write("".join(lines))
+
 def log_action(action):
-    """Save user actions to history file"""
-    with open(HISTORY_FILE, "a") as f:
-        f.write(f"[{datetime.datetime.now()}] {action}\n")
+    """Save user actions to history file (written in batches every few seconds)"""
+    buffer = history_buffer()
+    with buffer["lock"]:
+        buffer["lines"].append(f"[{datetime.datetime.now()}] {action}\n")
+        if buffer["timer"] is None:
+            buffer["timer"] = threading.Timer(HISTORY_FLUSH_SECONDS, flush_history, (buffer,))
+            buffer["timer"].daemon = True
+            buffer["timer"].start()
 
 def list_directory(directory_name):
     try:
@@ -93,27 +136,110 @@ def delete_directory(directory_name):
     except OSError as e:
         st.error(f"Error: {e}")
 
+def fast_copy(src, dest):
+    """Copy a file with its metadata, letting the OS move the data where it can"""
+    if platform.system() == "Windows":
+        import ctypes
+        if os.path.isdir(dest):
+            dest = os.path.join(dest, os.path.basename(src))
+        # CopyFileW copies in the kernel (with server-side offload on network shares)
+        # and keeps attributes and timestamps, like shutil.copy2
+        if not ctypes.windll.kernel32.CopyFileW(str(src), str(dest), False):
+            raise ctypes.WinError()
+        return dest
+    # On Linux/macOS shutil.copy2 already copies in the kernel (sendfile / fcopyfile)
+    return shutil.copy2(src, dest)
+
 def copy_file(src, dest):
     try:
-        shutil.copy2(src, dest)
+        fast_copy(src, dest)
         st.success(f"📄 Copied {src} → {dest}")
         log_action(f"Copied file from {src} to {dest}")
     except Exception as e:
         st.error(f"Error: {e}")
 
+def fast_move(src, dest):
+    """Move a file with a single rename when possible, falling back to fast_copy across filesystems"""
+    if os.path.isdir(dest):
+        dest = os.path.join(dest, os.path.basename(src))
+        if os.path.exists(dest):
+            raise FileExistsError(f"Destination path '{dest}' already exists")
+    try:
+        os.rename(src, dest)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        if os.path.isdir(src):
+            return shutil.move(src, dest)
+        fast_copy(src, dest)
+        os.unlink(src)
+    return dest
+
 def move_file(src, dest):
     try:
-        shutil.move(src, dest)
+        fast_move(src, dest)
         st.success(f"📁 Moved {src} → {dest}")
         log_action(f"Moved file from {src} to {dest}")
     except Exception as e:
         st.error(f"Error: {e}")
 
+def read_small_file(filename):
+    """Return the bytes of a regular file up to READ_AHEAD_LIMIT, otherwise None"""
+    if not os.path.isfile(filename) or os.path.getsize(filename) > READ_AHEAD_LIMIT:
+        return None
+    with open(filename, 'rb') as f:
+        return f.read()
+
+def is_compressed_format(filename):
+    """True for file types that are already compressed (see COMPRESSED_EXTS)"""
+    return os.path.splitext(filename)[1].lower() in COMPRESSED_EXTS
+
+def read_ahead_size(filename):
+    """Bytes read_small_file will hold in memory for filename (0 when it is streamed instead)"""
+    try:
+        size = os.path.getsize(filename) if os.path.isfile(filename) else 0
+    except OSError:
+        return 0
+    return size if size <= READ_AHEAD_LIMIT else 0
+
+def read_ahead(filenames):
+    """Yield (filename, bytes or None) in order while the next files are read concurrently.
+
+    At most READ_AHEAD_DEPTH files and READ_AHEAD_BUDGET bytes are buffered ahead of the consumer.
+    """
+    with ThreadPoolExecutor(max_workers=READ_AHEAD_DEPTH) as pool:
+        pending = deque()
+        buffered = 0
+        for filename in filenames:
+            size = read_ahead_size(filename)
+            # Hand over the oldest files until this one fits in the window
+            while pending and (len(pending) >= READ_AHEAD_DEPTH or buffered + size > READ_AHEAD_BUDGET):
+                name, data, name_size = pending.popleft()
+                buffered -= name_size
+                yield name, data.result()
+            pending.append((filename, pool.submit(read_small_file, filename), size))
+            buffered += size
+        while pending:
+            name, data, _ = pending.popleft()
+            yield name, data.result()
+
 def compress_files(filenames, archive_name):
     try:
         with zipfile.ZipFile(archive_name + '.zip', 'w') as zipf:
-            for filename in filenames:
-                zipf.write(filename, os.path.basename(filename))
+            # Reads of upcoming files overlap with writing the current one;
+            # large files and directories are streamed by zipf.write as before
+            for filename, data in read_ahead(filenames):
+                arcname = os.path.basename(filename)
+                # Store already-compressed formats as-is, deflate everything else at the fastest level
+                if is_compressed_format(filename):
+                    compress_type = zipfile.ZIP_STORED
+                else:
+                    compress_type = zipfile.ZIP_DEFLATED
+                if data is None:
+                    zipf.write(filename, arcname, compress_type=compress_type, compresslevel=1)
+                else:
+                    zipf.writestr(zipfile.ZipInfo.from_file(filename, arcname), data,
+                                  compress_type=compress_type, compresslevel=1)
         st.success(f"🗜️ Files compressed into {archive_name}.zip")
         log_action(f"Compressed {filenames} into {archive_name}.zip")
     except Exception as e:
@@ -153,14 +279,64 @@ option = st.sidebar.selectbox(
 # 💻 System Info
 st.sidebar.subheader("💻 System Information")
 
+@st.cache_data(ttl=10)
+def walk_counts(root):
+    """Count folders and files under root in a single scandir pass"""
+    total_dirs = total_files = 0
+    stack = [root]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                # DirEntry caches the d_type from the directory read, so no extra stat per entry
+                if entry.is_dir(follow_symlinks=False):
+                    total_dirs += 1
+                    stack.append(entry.path)
+                else:
+                    total_files += 1
+    return total_dirs, total_files
+
+@st.cache_data(ttl=2)
+def system_usage(root):
+    """CPU, disk and RAM usage, refreshed at most every couple of seconds"""
+    disk = psutil.disk_usage(root)
+    ram = psutil.virtual_memory()
+    # Right after the baseline the interval is too short to mean anything, so report None (n/a)
+    if time.monotonic() - cpu_percent_baseline() < CPU_SAMPLE_MIN_SECONDS:
+        return None, disk, ram
+    return psutil.cpu_percent(interval=None), disk, ram
+
+@st.cache_resource
+def load_gputil():
+    """Import GPUtil once; None when it is not installed"""
+    try:
+        import GPUtil
+        return GPUtil
+    except Exception:
+        return None
+
+@st.cache_data(ttl=5)
+def gpu_info():
+    """Name and load of the first GPU, or None"""
+    GPUtil = load_gputil()
+    if GPUtil is None:
+        return None
+    try:
+        gpus = GPUtil.getGPUs()
+    except Exception:
+        return None
+    if not gpus:
+        return None
+    return gpus[0].name, gpus[0].load
+
 current_dir = os.getcwd()
-total_files = sum(len(files) for _, _, files in os.walk(current_dir))
-total_dirs = sum(len(dirs) for _, dirs, _ in os.walk(current_dir))
-disk = psutil.disk_usage(current_dir)
+total_dirs, total_files = walk_counts(current_dir)
 
 # System info values
-cpu_percent = psutil.cpu_percent(interval=1)
-ram = psutil.virtual_memory()
+cpu_percent, disk, ram = system_usage(current_dir)
 ram_percent = ram.percent
 ram_used = ram.used // (1024 ** 3)
 ram_total = ram.total // (1024 ** 3)
@@ -171,22 +347,23 @@ st.sidebar.write(f"📁 **Folders:** {total_dirs}")
 st.sidebar.write(f"📄 **Files:** {total_files}")
 st.sidebar.write(f"🧠 **OS:** {platform.system()} {platform.release()}")
 st.sidebar.write(f"⚙️ **Python:** {platform.python_version()}")
-st.sidebar.write(f"🧩 **CPU Usage:** {cpu_percent}%")
-st.sidebar.progress(int(cpu_percent))
+if cpu_percent is None:
+    st.sidebar.write("🧩 **CPU Usage:** n/a (measuring...)")
+else:
+    st.sidebar.write(f"🧩 **CPU Usage:** {cpu_percent}%")
+    st.sidebar.progress(int(cpu_percent))
 st.sidebar.write(f"💾 **Disk Usage:** {disk.percent}% used ({disk.used // (1024**3)} GB / {disk.total // (1024**3)} GB)")
 st.sidebar.progress(int(disk.percent))
 st.sidebar.write(f"🧠 **RAM Usage:** {ram_percent}% ({ram_used} GB / {ram_total} GB)")
 st.sidebar.progress(int(ram_percent))
 
 # Optional GPU info (if available)
-try:
-    import GPUtil
-    gpus = GPUtil.getGPUs()
-    if gpus:
-        gpu = gpus[0]
-        st.sidebar.write(f"🎮 **GPU:** {gpu.name} ({gpu.load * 100:.1f}% load)")
-        st.sidebar.progress(int(gpu.load * 100))
-except Exception:
+gpu = gpu_info()
+if gpu:
+    gpu_name, gpu_load = gpu
+    st.sidebar.write(f"🎮 **GPU:** {gpu_name} ({gpu_load * 100:.1f}% load)")
+    st.sidebar.progress(int(gpu_load * 100))
+else:
     st.sidebar.write("🎮 **GPU:** Not detected")
 
 st.sidebar.markdown("---")
@@ -277,6 +454,7 @@ elif option == "Extract Files":
 
 elif option == "View Action History":
     st.subheader("📜 Action History")
+    flush_history(history_buffer())
     if os.path.exists(HISTORY_FILE):
         with open(HISTORY_FILE, "r") as f:
             st.text(f.read())
@@ -252,4 +252,26 @@ torch.onnx.export(
     opset_version=11
 )
 
-print("Model exported to ONNX format successfully")
\ No newline at end of file
+print("Model exported to ONNX format successfully")
+
+from torch.ao.quantization import get_default_qconfig_mapping
+from torch.ao.quantization import quantize_fx
+
+# Post-training int8 quantization (fbgemm kernels for x86 CPU serving)
+torch.backends.quantized.engine = "fbgemm"
+prepared = quantize_fx.prepare_fx(net.eval(), get_default_qconfig_mapping("fbgemm"), (example_input,))
+
+# Calibrate the observers on a few test batches
+with torch.no_grad():
+    for i, (images, _) in enumerate(test_loader):
+        prepared(images)
+        if i == 31:
+            break
+
+quantized_net = quantize_fx.convert_fx(prepared)
+
+# Save int8 model (load_model.py and web/serve_model.py pick it up from models/)
+int8_path = "/content/drive/MyDrive/models/model_int8.pt"
+torch.jit.save(torch.jit.trace(quantized_net, example_input), int8_path)
+
+print("Model exported to int8 TorchScript format successfully")
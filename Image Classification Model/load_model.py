@@ -1,7 +1,11 @@
 import torch
 from PIL import Image
 import os
-from torchvision import transforms
+import warnings
+from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
+from torchvision.io import decode_image, ImageReadMode
+from torchvision.transforms.functional import pil_to_tensor
 
 # Define your model architecture
 class ImprovedCNN(torch.nn.Module):
@@ -29,24 +33,59 @@ class ImprovedCNN(torch.nn.Module):
         x = self.fc3(x)
         return x
 
-# Load model
+def bf16_supported():
+    """True when oneDNN has native bfloat16 kernels on this CPU"""
+    try:
+        return torch.backends.mkldnn.is_available() and torch.ops.mkldnn._is_mkldnn_bf16_supported()
+    except (AttributeError, RuntimeError):
+        return False
+
+def optimize_for_inference(net):
+    """Freeze an eval-mode net into TorchScript using channels_last (and bfloat16 where the CPU has it)"""
+    net = net.eval().to(memory_format=torch.channels_last).to(INFERENCE_DTYPE)
+    example = torch.randn(1, 3, 32, 32, dtype=INFERENCE_DTYPE).contiguous(memory_format=torch.channels_last)
+    with torch.no_grad():
+        return torch.jit.freeze(torch.jit.trace(net, example))
+
+INFERENCE_DTYPE = torch.bfloat16 if bf16_supported() else torch.float32
+
+# Load model (prefer the int8 export from icm_improved.py when it is there)
 MODEL_PATH = "models/best_model.pth"
-if not os.path.exists(MODEL_PATH):
+INT8_MODEL_PATH = "models/model_int8.pt"
+if not os.path.exists(MODEL_PATH) and not os.path.exists(INT8_MODEL_PATH):
     print(f"Error: Model file not found at {MODEL_PATH}")
     exit(1)
 
 print("Loading model...")
-net = ImprovedCNN()
-net.load_state_dict(torch.load(MODEL_PATH, map_location='cpu'))
-net.eval()
+if os.path.exists(INT8_MODEL_PATH):
+    # Quantized convs take float32 input and quantize it themselves
+    INFERENCE_DTYPE = torch.float32
+    net = torch.jit.load(INT8_MODEL_PATH, map_location='cpu')
+else:
+    net = ImprovedCNN()
+    net.load_state_dict(torch.load(MODEL_PATH, map_location='cpu'))
+    net = optimize_for_inference(net)
 print("Model loaded successfully")
 
-# Transform for single image
-transform = transforms.Compose([
-    transforms.Resize((32, 32)),
-    transforms.ToTensor(),
-    transforms.Normalize((0.5, 0.5, 0.5), (0.5, 0.5, 0.5))
-])
+# Decode, resize and normalize a single image
+def image_to_tensor(raw):
+    """Decode encoded image bytes straight into a normalized (1, 3, 32, 32) float tensor"""
+    try:
+        # View the bytes in place; decode_image only reads its input, so the
+        # warning about wrapping a read-only buffer does not apply
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore", message="The given buffer is not writable")
+            encoded = torch.frombuffer(raw, dtype=torch.uint8)
+        image = decode_image(encoded, mode=ImageReadMode.RGB)
+    except (RuntimeError, ValueError):
+        # torchvision only decodes the formats it was built with; PIL covers the rest (gif, avif, ...)
+        image = pil_to_tensor(Image.open(BytesIO(raw)).convert("RGB"))
+    # Antialiased bilinear resize: close to PIL's Resize but not bit-identical, so
+    # confidences can differ slightly from the old PIL pipeline
+    image = torch.nn.functional.interpolate(image.unsqueeze(0).float(), size=(32, 32), mode='bilinear',
+                                            align_corners=False, antialias=True)
+    # Same as ToTensor + Normalize((0.5, 0.5, 0.5), (0.5, 0.5, 0.5)) in one pass
+    return image.div_(127.5).sub_(1.0)
 
 # Class names
 class_names = ['plane', 'car', 'bird', 'cat', 'deer', 'dog', 'frog', 'horse', 'ship', 'truck']
@@ -55,17 +94,32 @@ class_names = ['plane', 'car', 'bird', 'cat', 'deer', 'dog', 'frog', 'horse', 's
 image_folder = 'test-images'
 supported_formats = ('.png', '.jpg', '.jpeg', '.webp', '.avif')
 
+def load_image(img_path):
+    with open(img_path, 'rb') as f:
+        return image_to_tensor(f.read())
+
 print("\nTesting on sample images:")
-for img_file in os.listdir(image_folder):
-    if img_file.lower().endswith(supported_formats):
-        img_path = os.path.join(image_folder, img_file)
-        try:
-            image = Image.open(img_path).convert("RGB")
-            image = transform(image).unsqueeze(0)  # Add batch dim
-            with torch.no_grad():
-                output = net(image)
-                _, predicted = torch.max(output, 1)
-                probabilities = torch.nn.functional.softmax(output, dim=1)[0] * 100
-            print(f"Image: {img_file:15} --> Predicted: {class_names[predicted.item()]:6} ({probabilities[predicted.item()]:.1f}%)")
-        except Exception as e:
-            print(f"Error processing {img_file}: {str(e)}")
\ No newline at end of file
+with os.scandir(image_folder) as it:
+    img_files = sorted((entry.name, entry.path) for entry in it
+                       if entry.is_file() and entry.name.lower().endswith(supported_formats))
+
+# Decode on a few threads, then classify every image in one forward pass
+with ThreadPoolExecutor(max_workers=4) as pool:
+    futures = [pool.submit(load_image, img_path) for _, img_path in img_files]
+
+names, images = [], []
+for (img_file, _), future in zip(img_files, futures):
+    try:
+        images.append(future.result())
+        names.append(img_file)
+    except Exception as e:
+        print(f"Error processing {img_file}: {str(e)}")
+
+if images:
+    batch = torch.cat(images).to(INFERENCE_DTYPE).contiguous(memory_format=torch.channels_last)
+    with torch.inference_mode():
+        output = net(batch).float()
+        _, predicted = torch.max(output, 1)
+        probabilities = output.softmax(1) * 100
+    for img_file, label, probs in zip(names, predicted.tolist(), probabilities):
+        print(f"Image: {img_file:15} --> Predicted: {class_names[label]:6} ({probs[label]:.1f}%)")
\ No newline at end of file
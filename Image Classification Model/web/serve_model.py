@@ -1,11 +1,17 @@
 import os
+import warnings
 from flask import Flask, request, jsonify, send_from_directory
 import torch
-from torchvision import transforms
+from torchvision.io import decode_image, ImageReadMode
+from torchvision.transforms.functional import pil_to_tensor
 from PIL import Image
 import logging
 import requests
+from requests.adapters import HTTPAdapter
 from io import BytesIO
+import queue
+import threading
+import time
 
 # Initialize Flask app with correct static folder path
 app = Flask(__name__, static_folder='../web', static_url_path='')
@@ -15,6 +21,8 @@ UPLOAD_FOLDER = os.path.join(os.path.dirname(__file__), '..', 'web', 'uploads')
 ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'avif', 'webp'}
 app.config["UPLOAD_FOLDER"] = UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB limit
+BATCH_MAX_SIZE = 32  # Most requests run in one forward pass
+BATCH_WAIT_SECONDS = 0.005  # How long the first request waits for others to join its batch
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -23,6 +31,12 @@ logger = logging.getLogger(__name__)
 # Ensure upload folder exists
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
+# Shared HTTP session so repeated /predict-url calls reuse kept-alive connections
+http_session = requests.Session()
+http_adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=1)
+http_session.mount('http://', http_adapter)
+http_session.mount('https://', http_adapter)
+
 # Model architecture
 class ImprovedCNN(torch.nn.Module):
     def __init__(self):
@@ -49,24 +63,104 @@ class ImprovedCNN(torch.nn.Module):
         x = self.fc3(x)
         return x
 
+def bf16_supported():
+    """True when oneDNN has native bfloat16 kernels on this CPU"""
+    try:
+        return torch.backends.mkldnn.is_available() and torch.ops.mkldnn._is_mkldnn_bf16_supported()
+    except (AttributeError, RuntimeError):
+        return False
+
+def optimize_for_inference(net):
+    """Freeze an eval-mode net into TorchScript using channels_last (and bfloat16 where the CPU has it)"""
+    net = net.eval().to(memory_format=torch.channels_last).to(INFERENCE_DTYPE)
+    example = torch.randn(1, 3, 32, 32, dtype=INFERENCE_DTYPE).contiguous(memory_format=torch.channels_last)
+    with torch.no_grad():
+        return torch.jit.freeze(torch.jit.trace(net, example))
+
+INFERENCE_DTYPE = torch.bfloat16 if bf16_supported() else torch.float32
+
 # Load model
 MODEL_PATH = os.path.join(os.path.dirname(__file__), '..', 'models', 'best_model.pth')
+INT8_MODEL_PATH = os.path.join(os.path.dirname(__file__), '..', 'models', 'model_int8.pt')
 try:
-    model = ImprovedCNN()
-    model.load_state_dict(torch.load(MODEL_PATH, map_location=torch.device('cpu')))
-    model.eval()
-    logger.info("Model loaded successfully from %s", MODEL_PATH)
+    if os.path.exists(INT8_MODEL_PATH):
+        # Quantized export from icm_improved.py; its convs take float32 input and quantize it themselves
+        INFERENCE_DTYPE = torch.float32
+        model = torch.jit.load(INT8_MODEL_PATH, map_location=torch.device('cpu'))
+        logger.info("Model loaded successfully from %s (int8)", INT8_MODEL_PATH)
+    else:
+        model = ImprovedCNN()
+        model.load_state_dict(torch.load(MODEL_PATH, map_location=torch.device('cpu')))
+        model = optimize_for_inference(model)
+        logger.info("Model loaded successfully from %s (%s)", MODEL_PATH, INFERENCE_DTYPE)
 except Exception as e:
     logger.error("Failed to load model: %s", str(e))
     raise
 
 CLASS_NAMES = ['plane', 'car', 'bird', 'cat', 'deer', 'dog', 'frog', 'horse', 'ship', 'truck']
 
-transform = transforms.Compose([
-    transforms.Resize((32, 32)),
-    transforms.ToTensor(),
-    transforms.Normalize((0.5, 0.5, 0.5), (0.5, 0.5, 0.5)),
-])
+def image_to_tensor(raw):
+    """Decode encoded image bytes straight into a normalized (1, 3, 32, 32) float tensor"""
+    try:
+        # View the bytes in place; decode_image only reads its input, so the
+        # warning about wrapping a read-only buffer does not apply
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore", message="The given buffer is not writable")
+            encoded = torch.frombuffer(raw, dtype=torch.uint8)
+        image = decode_image(encoded, mode=ImageReadMode.RGB)
+    except (RuntimeError, ValueError):
+        # torchvision only decodes the formats it was built with; PIL covers the rest (gif, avif, ...)
+        image = pil_to_tensor(Image.open(BytesIO(raw)).convert("RGB"))
+    # Antialiased bilinear resize: close to PIL's Resize but not bit-identical, so
+    # confidences can differ slightly from the old PIL pipeline
+    image = torch.nn.functional.interpolate(image.unsqueeze(0).float(), size=(32, 32), mode='bilinear',
+                                            align_corners=False, antialias=True)
+    # Same as ToTensor + Normalize((0.5, 0.5, 0.5), (0.5, 0.5, 0.5)) in one pass
+    return image.div_(127.5).sub_(1.0)
+
+batch_queue = queue.Queue()
+
+def collect_batch():
+    """Block for one request, then gather whatever else arrives within the batch window"""
+    batch = [batch_queue.get()]
+    deadline = time.monotonic() + BATCH_WAIT_SECONDS
+    while len(batch) < BATCH_MAX_SIZE:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            batch.append(batch_queue.get(timeout=remaining))
+        except queue.Empty:
+            break
+    return batch
+
+def batch_worker():
+    """Run queued requests through the model together and hand each its own row"""
+    while True:
+        batch = collect_batch()
+        try:
+            inputs = torch.cat([input_tensor for input_tensor, _, _ in batch])
+            inputs = inputs.to(INFERENCE_DTYPE).contiguous(memory_format=torch.channels_last)
+            with torch.inference_mode():
+                results = model(inputs).float().softmax(1) * 100
+        except Exception as e:
+            logger.error("Batch inference error: %s", str(e))
+            results = [e] * len(batch)
+        for (_, done, result), row in zip(batch, results):
+            result.append(row)
+            done.set()
+
+threading.Thread(target=batch_worker, daemon=True).start()
+
+def predict_probabilities(input_tensor):
+    """Queue a (1, 3, 32, 32) tensor for the batch worker and return class probabilities in percent"""
+    done = threading.Event()
+    result = []
+    batch_queue.put((input_tensor, done, result))
+    done.wait()
+    if isinstance(result[0], Exception):
+        raise result[0]
+    return result[0]
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
@@ -96,17 +190,17 @@ def predict():
         return jsonify({"error": "File type not allowed"}), 400
 
     try:
-        filename = os.path.join(app.config["UPLOAD_FOLDER"], file.filename)
-        file.save(filename)
-        
-        image = Image.open(filename).convert("RGB")
-        input_tensor = transform(image).unsqueeze(0)
+        # Decode straight from the upload; only keep a copy on disk when asked to
+        raw = file.read()
+        if request.args.get('save') == '1':
+            with open(os.path.join(app.config["UPLOAD_FOLDER"], file.filename), 'wb') as f:
+                f.write(raw)
 
-        with torch.no_grad():
-            outputs = model(input_tensor)
-            probabilities = torch.nn.functional.softmax(outputs, dim=1)[0] * 100
-            _, predicted = torch.max(outputs, 1)
-            predicted_class = CLASS_NAMES[predicted.item()]
+        input_tensor = image_to_tensor(raw)
+
+        probabilities = predict_probabilities(input_tensor)
+        predicted = probabilities.argmax()
+        predicted_class = CLASS_NAMES[predicted.item()]
 
         return jsonify({
             "class": predicted_class,
@@ -129,19 +223,17 @@ def predict_url():
         if not is_valid_url(data['url']):
             return jsonify({"error": "Invalid image URL"}), 400
 
-        # Download the image from the URL with timeout
-        response = requests.get(data['url'], timeout=10)
-        response.raise_for_status()
-        
+        # Download the image from the URL with timeout, streaming so the connection goes back to the pool
+        with http_session.get(data['url'], timeout=10, stream=True) as response:
+            response.raise_for_status()
+            raw = response.content
+
         # Open the image
-        image = Image.open(BytesIO(response.content)).convert("RGB")
-        input_tensor = transform(image).unsqueeze(0)
-
-        with torch.no_grad():
-            outputs = model(input_tensor)
-            probabilities = torch.nn.functional.softmax(outputs, dim=1)[0] * 100
-            _, predicted = torch.max(outputs, 1)
-            predicted_class = CLASS_NAMES[predicted.item()]
+        input_tensor = image_to_tensor(raw)
+
+        probabilities = predict_probabilities(input_tensor)
+        predicted = probabilities.argmax()
+        predicted_class = CLASS_NAMES[predicted.item()]
 
         return jsonify({
             "class": predicted_class,
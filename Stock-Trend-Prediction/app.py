@@ -1,13 +1,29 @@
 import numpy as np
 import pandas as pd
-import yfinance as yf
-from keras.models import load_model
+import bottleneck as bn
 import streamlit as st
 import matplotlib.pyplot as plt
 from sklearn.preprocessing import MinMaxScaler
 
-# Load the pre-trained model
-model = load_model('Stock_Predictions_Model.keras')
+@st.cache_resource
+def load_predictor():
+    """Load the pre-trained model once per server process"""
+    # keras pulls in TensorFlow, so import it only when the model is first needed
+    from keras.models import load_model
+    return load_model('Stock_Predictions_Model.keras')
+
+@st.cache_data(ttl=3600)
+def fetch_stock_data(stock, start, end):
+    """Download price history, reused across reruns for an hour"""
+    import yfinance as yf
+    return yf.download(stock, start, end)
+
+@st.cache_data(ttl=3600)
+def moving_averages(stock, start, end):
+    """50, 100 and 200 day moving averages of the closing price"""
+    close = fetch_stock_data(stock, start, end)['Close']
+    values = close.to_numpy(dtype=np.float64).ravel()
+    return tuple(pd.Series(bn.move_mean(values, window), index=close.index) for window in (50, 100, 200))
 
 # Streamlit app title
 st.title('Stock Market Predictor')
@@ -20,7 +36,7 @@ start = '2012-01-01'
 end = '2022-12-31'
 
 # Fetch stock data
-data = yf.download(stock, start, end)
+data = fetch_stock_data(stock, start, end)
 
 # Display stock data
 st.subheader('Stock Data')
@@ -37,44 +53,61 @@ data_test = pd.concat([past_100_days, data_test], ignore_index=True)
 data_test_scaled = scaler.fit_transform(data_test)
 
 # Calculate moving averages
+ma_50_days, ma_100_days, ma_200_days = moving_averages(stock, start, end)
+close = data['Close']
+
+def line_xy(series):
+    """Dates and values of a price series as flat arrays for plotting"""
+    return series.index, series.to_numpy().ravel()
+
+def price_figure(key, series):
+    """Build the figure on the first run of a session; later reruns only swap in the new line data"""
+    if key not in st.session_state:
+        fig, ax = plt.subplots(figsize=(10, 6))
+        lines = [ax.plot(*line_xy(values), color, label=label)[0] for values, color, label in series]
+        ax.legend()
+        st.session_state[key] = fig, lines
+        return fig
+    fig, lines = st.session_state[key]
+    for line, (values, _, _) in zip(lines, series):
+        line.set_data(*line_xy(values))
+    ax = fig.axes[0]
+    ax.relim()
+    ax.autoscale_view()
+    return fig
+
 st.subheader('Price vs MA50')
-ma_50_days = data['Close'].rolling(50).mean()
-fig1 = plt.figure(figsize=(10, 6))
-plt.plot(ma_50_days, 'r', label='50-day Moving Average')
-plt.plot(data['Close'], 'g', label='Closing Price')
-plt.legend()
-st.pyplot(fig1)
+fig1 = price_figure('fig_ma50', [
+    (ma_50_days, 'r', '50-day Moving Average'),
+    (close, 'g', 'Closing Price'),
+])
+st.pyplot(fig1, clear_figure=False)
 
 st.subheader('Price vs MA50 vs MA100')
-ma_100_days = data['Close'].rolling(100).mean()
-fig2 = plt.figure(figsize=(10, 6))
-plt.plot(ma_50_days, 'r', label='50-day Moving Average')
-plt.plot(ma_100_days, 'b', label='100-day Moving Average')
-plt.plot(data['Close'], 'g', label='Closing Price')
-plt.legend()
-st.pyplot(fig2)
+fig2 = price_figure('fig_ma100', [
+    (ma_50_days, 'r', '50-day Moving Average'),
+    (ma_100_days, 'b', '100-day Moving Average'),
+    (close, 'g', 'Closing Price'),
+])
+st.pyplot(fig2, clear_figure=False)
 
 st.subheader('Price vs MA100 vs MA200')
-ma_200_days = data['Close'].rolling(200).mean()
-fig3 = plt.figure(figsize=(10, 6))
-plt.plot(ma_100_days, 'r', label='100-day Moving Average')
-plt.plot(ma_200_days, 'b', label='200-day Moving Average')
-plt.plot(data['Close'], 'g', label='Closing Price')
-plt.legend()
-st.pyplot(fig3)
-
-# Prepare data for predictions
-x = []
-y = []
-
-for i in range(100, data_test_scaled.shape[0]):
-    x.append(data_test_scaled[i-100:i])
-    y.append(data_test_scaled[i, 0])
-
-x, y = np.array(x), np.array(y)
-
-# Make predictions
-predictions = model.predict(x)
+fig3 = price_figure('fig_ma200', [
+    (ma_100_days, 'r', '100-day Moving Average'),
+    (ma_200_days, 'b', '200-day Moving Average'),
+    (close, 'g', 'Closing Price'),
+])
+st.pyplot(fig3, clear_figure=False)
+
+# Prepare data for predictions: every 100-day window and the day that follows it
+windows = np.lib.stride_tricks.sliding_window_view(data_test_scaled[:-1], (100, data_test_scaled.shape[1]))
+# float32 is what the LSTM runs in, so Keras does not make its own converted copy
+x = np.ascontiguousarray(windows[:, 0], dtype=np.float32)
+y = data_test_scaled[100:, 0].astype(np.float32)
+
+# Load the pre-trained model and make predictions
+model = load_predictor()
+predictions = model.predict(x, batch_size=256, verbose=0)
 
 # Scale predictions back to original range
 scale = 1 / scaler.scale_